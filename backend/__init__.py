@@ -1 +1,9 @@
 # AI Agent Backend
+
+import sys
+from pathlib import Path
+
+# Put the project root on sys.path once for every backend module (so `config` imports resolve)
+_project_root = str(Path(__file__).resolve().parent.parent)
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
@@ -0,0 +1,23 @@
+"""Fast JSON helpers for tool-call arguments and tool results (orjson, with stdlib fallback)."""
+
+from typing import Any
+
+try:
+    import orjson
+
+    JSONDecodeError = orjson.JSONDecodeError
+    loads = orjson.loads
+
+    def dumps(obj: Any) -> str:
+        """Serialize obj to a JSON str (orjson returns bytes; the OpenAI SDK expects str)."""
+        return orjson.dumps(obj).decode()
+
+except ImportError:  # pragma: no cover - orjson is optional at runtime
+    import json
+
+    JSONDecodeError = json.JSONDecodeError
+    loads = json.loads
+
+    def dumps(obj: Any) -> str:
+        """Serialize obj to a JSON str."""
+        return json.dumps(obj)
@@ -0,0 +1,62 @@
+"""SQLite-backed cache of embedding vectors keyed by a hash of (model, text)."""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILENAME = "embedding_cache.sqlite"
+# Keep IN (...) lists under SQLite's bound-parameter limit
+_QUERY_BATCH = 500
+
+
+def cache_key(model: str, text: str) -> str:
+    """Stable key for one embedding input."""
+    return hashlib.blake2b(f"{model}\x00{text}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+class EmbeddingCache:
+    """Stores vectors as float32 blobs (~6 KB per 1536-dim embedding)."""
+
+    def __init__(self, path: Path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vec BLOB NOT NULL)")
+            self._conn.commit()
+
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        """Return {key: vector} for the keys present in the cache."""
+        found: dict[str, list[float]] = {}
+        with self._lock:
+            for i in range(0, len(keys), _QUERY_BATCH):
+                batch = keys[i:i + _QUERY_BATCH]
+                rows = self._conn.execute(
+                    f"SELECT key, vec FROM embeddings WHERE key IN ({','.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+                for key, blob in rows:
+                    vec = array("f")
+                    vec.frombytes(blob)
+                    found[key] = vec.tolist()
+        return found
+
+    def put_many(self, items: Iterable[tuple[str, list[float]]]) -> None:
+        """Insert or replace vectors."""
+        rows = [(key, array("f", vec).tobytes()) for key, vec in items]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)", rows)
+            self._conn.commit()
+
+
+@lru_cache(maxsize=4)
+def get_embedding_cache(directory: Path) -> EmbeddingCache:
+    """Return the process-wide cache stored in directory."""
+    return EmbeddingCache(Path(directory) / CACHE_FILENAME)
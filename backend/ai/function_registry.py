@@ -1,9 +1,11 @@
 """Registry of tools/functions available to the LLM."""
 
-import json
 import logging
+from functools import lru_cache
 from typing import Any, Callable, Optional
 
+from backend.ai import _json
+
 logger = logging.getLogger(__name__)
 
 # OpenAI tool schema: list of {"type": "function", "function": {"name", "description", "parameters"}}
@@ -73,32 +75,43 @@ OPENAI_TOOLS: list[dict[str, Any]] = [
     },
 ]
 
+# Frozen once at import and shared by every registry
+_TOOLS: tuple[dict[str, Any], ...] = tuple(OPENAI_TOOLS)
+
+
+@lru_cache(maxsize=64)
+def _unknown_tool_json(name: str) -> str:
+    """Error payload for an unregistered tool name (cached per name)."""
+    return _json.dumps({"error": f"Unknown tool: {name}"})
+
 
 class FunctionRegistry:
     """Registry that maps tool names to callables and provides OpenAI tool schemas."""
 
     def __init__(self):
         self._handlers: dict[str, Callable[..., Any]] = {}
-        self._tools = OPENAI_TOOLS
+        self._handlers_get = self._handlers.get
+        self._tools = _TOOLS
 
     def register(self, name: str, handler: Callable[..., Any]) -> None:
         self._handlers[name] = handler
 
-    def get_tools(self) -> list[dict[str, Any]]:
+    def get_tools(self) -> tuple[dict[str, Any], ...]:
         return self._tools
 
     def execute(self, name: str, arguments: dict[str, Any]) -> str:
         """Execute a registered function by name. Returns result as string for LLM."""
-        if name not in self._handlers:
-            return json.dumps({"error": f"Unknown tool: {name}"})
+        handler = self._handlers_get(name)
+        if handler is None:
+            return _unknown_tool_json(name)
         try:
-            result = self._handlers[name](**arguments)
+            result = handler(**arguments)
             if isinstance(result, str):
                 return result
-            return json.dumps(result) if result is not None else "Done"
+            return _json.dumps(result) if result is not None else "Done"
         except Exception as e:
             logger.exception("Tool %s failed: %s", name, e)
-            return json.dumps({"error": str(e)})
+            return _json.dumps({"error": str(e)})
 
     def get_handler(self, name: str) -> Optional[Callable[..., Any]]:
         return self._handlers.get(name)
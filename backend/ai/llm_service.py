@@ -1,21 +1,36 @@
 """OpenAI API wrapper with function calling support."""
 
 import logging
-from typing import Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Iterator, Optional, Sequence
 
+import httpx
 from openai import OpenAI
 
-import sys
-from pathlib import Path
-_project_root = Path(__file__).resolve().parent.parent.parent
-if str(_project_root) not in sys.path:
-    sys.path.insert(0, str(_project_root))
 from config.settings import get_settings
+from backend.ai.embedding_cache import cache_key, get_embedding_cache
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_MODEL = "gpt-5-mini"
 DEFAULT_EMBEDDING_MODEL = "text-embedding-3-small"
+# Inputs per embeddings request, and how many requests may be in flight at once
+EMBED_BATCH_SIZE = 256
+EMBED_MAX_WORKERS = 4
+
+
+@lru_cache(maxsize=4)
+def _get_openai(api_key: str) -> OpenAI:
+    """Return a shared OpenAI client per API key so all services reuse one HTTP connection pool."""
+    return OpenAI(
+        api_key=api_key,
+        http_client=httpx.Client(
+            timeout=httpx.Timeout(600.0, connect=10.0),
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+            follow_redirects=True,
+        ),
+    )
 
 
 class LLMService:
@@ -28,14 +43,15 @@ class LLMService:
         embedding_model: str = DEFAULT_EMBEDDING_MODEL,
     ):
         settings = get_settings()
-        self._client = OpenAI(api_key=api_key or settings.openai_api_key)
+        self._client = _get_openai(api_key or settings.openai_api_key)
+        self._embeddings_dir = settings.embeddings_dir
         self.model = model
         self.embedding_model = embedding_model
 
     def chat(
         self,
         messages: list[dict[str, Any]],
-        tools: Optional[list[dict[str, Any]]] = None,
+        tools: Optional[Sequence[dict[str, Any]]] = None,
         tool_choice: Optional[str] = "auto",
     ) -> dict[str, Any]:
         """
@@ -62,10 +78,56 @@ class LLMService:
             logger.exception("OpenAI chat error: %s", e)
             raise
 
+    def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: Optional[Sequence[dict[str, Any]]] = None,
+        tool_choice: Optional[str] = "auto",
+    ) -> Iterator[tuple[str, Any]]:
+        """
+        Streaming chat completion. Yields ("text", delta) as content arrives, then one
+        ("done", {"content": str, "tool_calls": [(id, name, arguments), ...]}) with the
+        tool calls reassembled from their streamed fragments.
+        """
+        kwargs: dict[str, Any] = {
+            "model": self.model,
+            "messages": messages,
+            "stream": True,
+        }
+        if tools:
+            kwargs["tools"] = tools
+            kwargs["tool_choice"] = tool_choice
+        try:
+            stream = self._client.chat.completions.create(**kwargs)
+            parts: list[str] = []
+            # tool call index -> [id, name, argument fragments]
+            calls: dict[int, list[Any]] = {}
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                if delta.content:
+                    parts.append(delta.content)
+                    yield "text", delta.content
+                for tc in delta.tool_calls or ():
+                    entry = calls.setdefault(tc.index, ["", "", []])
+                    if tc.id:
+                        entry[0] = tc.id
+                    if tc.function is not None:
+                        if tc.function.name:
+                            entry[1] += tc.function.name
+                        if tc.function.arguments:
+                            entry[2].append(tc.function.arguments)
+        except Exception as e:
+            logger.exception("OpenAI chat stream error: %s", e)
+            raise
+        tool_calls = [(tid, name, "".join(args) or "{}") for tid, name, args in (calls[i] for i in sorted(calls))]
+        yield "done", {"content": "".join(parts), "tool_calls": tool_calls}
+
     def chat_with_tools(
         self,
         messages: list[dict[str, Any]],
-        tools: list[dict[str, Any]],
+        tools: Sequence[dict[str, Any]],
         max_rounds: int = 5,
     ) -> tuple[str, list[dict[str, Any]]]:
         """
@@ -74,30 +136,20 @@ class LLMService:
         Returns (final_text_response, updated_messages).
         """
         current = list(messages)
+        append = current.append
         for _ in range(max_rounds):
             response = self.chat(current, tools=tools)
-            current.append(
-                {
-                    "role": "assistant",
-                    "content": response.get("content") or "",
-                    "tool_calls": response.get("tool_calls"),
-                }
-            )
+            content = response.get("content") or ""
             tool_calls = response.get("tool_calls")
+            append({"role": "assistant", "content": content, "tool_calls": tool_calls})
             if not tool_calls:
-                return (response.get("content") or "", current)
+                return (content, current)
             for tc in tool_calls:
                 tid = tc.id
                 name = tc.function.name
-                args_str = tc.function.arguments or "{}"
-                try:
-                    import json
-                    args = json.loads(args_str)
-                except json.JSONDecodeError:
-                    args = {}
                 # Caller must inject tool execution; we only append placeholder
                 # so the registry can be used by the caller to run and fill in.
-                current.append(
+                append(
                     {
                         "role": "tool",
                         "tool_call_id": tid,
@@ -106,20 +158,54 @@ class LLMService:
                 )
         return (current[-1].get("content", ""), current)
 
-    def embed(self, texts: list[str]) -> list[list[float]]:
-        """Return embeddings for a list of texts."""
+    def embed(self, texts: list[str], batch_size: int = EMBED_BATCH_SIZE) -> list[list[float]]:
+        """
+        Return embeddings for a list of texts, in input order.
+        Previously seen texts are served from the on-disk embedding cache; the rest
+        are split into batches of batch_size sent concurrently. Keep each text under
+        ~8k tokens (the embedding model's per-input limit).
+        """
         if not texts:
             return []
+        keys = [cache_key(self.embedding_model, t) for t in texts]
         try:
-            r = self._client.embeddings.create(
-                model=self.embedding_model,
-                input=texts,
-            )
-            return [item.embedding for item in r.data]
+            cache = get_embedding_cache(self._embeddings_dir)
+            vectors = cache.get_many(keys)
+        except Exception as e:
+            logger.warning("Embedding cache unavailable: %s", e)
+            cache, vectors = None, {}
+        missing = {k: t for k, t in zip(keys, texts) if k not in vectors}
+        if missing:
+            fresh = self._embed_uncached(list(missing.values()), batch_size)
+            vectors.update(zip(missing, fresh))
+            if cache is not None:
+                try:
+                    cache.put_many(zip(missing, fresh))
+                except Exception as e:
+                    logger.warning("Embedding cache write failed: %s", e)
+        return [vectors[k] for k in keys]
+
+    def _embed_uncached(self, texts: list[str], batch_size: int) -> list[list[float]]:
+        """Embed texts via the API, batch_size inputs per concurrent request."""
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        try:
+            if len(batches) == 1:
+                return self._embed_batch(batches[0])
+            with ThreadPoolExecutor(max_workers=min(EMBED_MAX_WORKERS, len(batches))) as pool:
+                results = list(pool.map(self._embed_batch, batches))
+            return [vec for batch in results for vec in batch]
         except Exception as e:
             logger.exception("OpenAI embed error: %s", e)
             raise
 
+    def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed one batch with a single API request."""
+        r = self._client.embeddings.create(
+            model=self.embedding_model,
+            input=texts,
+        )
+        return [item.embedding for item in r.data]
+
     def transcribe_audio(self, file_path: str) -> str:
         """Transcribe audio file using Whisper."""
         with open(file_path, "rb") as f:
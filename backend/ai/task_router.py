@@ -1,15 +1,10 @@
 """Intent classification and task routing using LLM and function registry."""
 
-import json
 import logging
-from typing import Any, Optional
-
-import sys
-from pathlib import Path
-_project_root = Path(__file__).resolve().parent.parent.parent
-if str(_project_root) not in sys.path:
-    sys.path.insert(0, str(_project_root))
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator, Optional
 
+from backend.ai import _json
 from backend.ai.function_registry import FunctionRegistry
 from backend.ai.llm_service import LLMService
 
@@ -24,6 +19,12 @@ SYSTEM_PROMPT = """You are a helpful AI assistant. You can:
 
 When the user asks you to do something that requires a tool (calendar, note, email, document search), use the appropriate function. Otherwise respond in natural language. Be concise and helpful."""
 
+# Read-only tools that may run concurrently when the model calls several in one turn
+PARALLEL_SAFE_TOOLS = frozenset({"search_documents"})
+MAX_PARALLEL_TOOL_CALLS = 8
+# Model/tool round trips per user message before giving up
+MAX_TOOL_ROUNDS = 5
+
 
 class TaskRouter:
     """Routes user messages to LLM with tools and executes function calls."""
@@ -37,62 +38,114 @@ class TaskRouter:
         self.registry = registry or FunctionRegistry()
         self._tools = self.registry.get_tools()
 
-    def process(
+    def _run_tool_call(self, name: str, args_str: str) -> str:
+        """Parse one tool call's JSON arguments and execute it; returns the tool result string."""
+        try:
+            args = _json.loads(args_str)
+        except _json.JSONDecodeError as e:
+            # Report bad arguments to the model instead of calling the handler with none
+            return _json.dumps({"error": f"Invalid JSON arguments for {name}: {e}"})
+        return self.registry.execute(name, args)
+
+    def _build_messages(
         self,
         user_message: str,
-        history: Optional[list[dict[str, Any]]] = None,
-        image_url_or_base64: Optional[str] = None,
-    ) -> str:
-        """
-        Process user message: build messages, call LLM with tools, execute any
-        tool_calls, and return final assistant text. Optionally include image for vision.
-        """
+        history: Optional[list[dict[str, Any]]],
+        image_url_or_base64: Optional[str],
+    ) -> list[dict[str, Any]]:
+        """System prompt, prior turns, and the new user message (with image for vision if given)."""
         messages: list[dict[str, Any]] = [
             {"role": "system", "content": SYSTEM_PROMPT},
         ]
         if history:
             messages.extend(history)
-        # Build user message content
-        content: Any = [{"type": "text", "text": user_message}]
+        # Build user message content: plain text unless an image is attached
+        content: Any = user_message
         if image_url_or_base64:
             if image_url_or_base64.startswith("http"):
-                content.append({"type": "image_url", "image_url": {"url": image_url_or_base64}})
+                url = image_url_or_base64
             else:
-                content.append({"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{image_url_or_base64}"}})
-        if len(content) == 1:
-            content = user_message
+                url = f"data:image/jpeg;base64,{image_url_or_base64}"
+            content = [
+                {"type": "text", "text": user_message},
+                {"type": "image_url", "image_url": {"url": url}},
+            ]
         messages.append({"role": "user", "content": content})
+        return messages
 
-        current = list(messages)
-        max_rounds = 5
-        for _ in range(max_rounds):
+    def _dispatch(
+        self,
+        current: list[dict[str, Any]],
+        assistant_content: str,
+        calls: list[tuple[str, str, str]],
+    ) -> None:
+        """Echo the assistant's (id, name, arguments) tool calls into current, run them, and append the results."""
+        append = current.append
+        append(
+            {
+                "role": "assistant",
+                "content": assistant_content,
+                "tool_calls": [
+                    {"id": tid, "type": "function", "function": {"name": name, "arguments": args_str}}
+                    for tid, name, args_str in calls
+                ],
+            }
+        )
+        run_call = self._run_tool_call
+        names = [name for _, name, _ in calls]
+        arg_strs = [args_str for _, _, args_str in calls]
+        if len(calls) > 1 and PARALLEL_SAFE_TOOLS.issuperset(names):
+            with ThreadPoolExecutor(max_workers=min(len(calls), MAX_PARALLEL_TOOL_CALLS)) as pool:
+                results = list(pool.map(run_call, names, arg_strs))
+        else:
+            results = [run_call(name, args_str) for name, args_str in zip(names, arg_strs)]
+        # Results stay in tool_call order (pool.map preserves input order)
+        for (tid, _, _), result in zip(calls, results):
+            append({"role": "tool", "tool_call_id": tid, "content": result})
+
+    def process(
+        self,
+        user_message: str,
+        history: Optional[list[dict[str, Any]]] = None,
+        image_url_or_base64: Optional[str] = None,
+    ) -> str:
+        """
+        Process user message: build messages, call LLM with tools, execute any
+        tool_calls, and return final assistant text. Optionally include image for vision.
+        """
+        # messages is built fresh, so the loop extends it in place
+        current = self._build_messages(user_message, history, image_url_or_base64)
+        for _ in range(MAX_TOOL_ROUNDS):
             response = self.llm.chat(current, tools=self._tools)
             assistant_content = response.get("content") or ""
             tool_calls = response.get("tool_calls")
-            current.append(
-                {
-                    "role": "assistant",
-                    "content": assistant_content,
-                    "tool_calls": [
-                        {
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {"name": tc.function.name, "arguments": tc.function.arguments or "{}"},
-                        }
-                        for tc in (tool_calls or [])
-                    ],
-                }
-            )
             if not tool_calls:
                 return assistant_content
-            for tc in tool_calls:
-                name = tc.function.name
-                try:
-                    args = json.loads(tc.function.arguments or "{}")
-                except json.JSONDecodeError:
-                    args = {}
-                result = self.registry.execute(name, args)
-                current.append(
-                    {"role": "tool", "tool_call_id": tc.id, "content": result}
-                )
+            # Read each SDK tool call once; reuse for both the echoed assistant message and dispatch
+            calls = [(tc.id, tc.function.name, tc.function.arguments or "{}") for tc in tool_calls]
+            self._dispatch(current, assistant_content, calls)
         return current[-1].get("content", "") if current else ""
+
+    def process_stream(
+        self,
+        user_message: str,
+        history: Optional[list[dict[str, Any]]] = None,
+        image_url_or_base64: Optional[str] = None,
+    ) -> Iterator[str]:
+        """
+        Like process(), but yield assistant text as the model generates it. Tool
+        rounds run between streamed completions exactly as in process().
+        """
+        current = self._build_messages(user_message, history, image_url_or_base64)
+        for _ in range(MAX_TOOL_ROUNDS):
+            final: dict[str, Any] = {}
+            for kind, value in self.llm.chat_stream(current, tools=self._tools):
+                if kind == "text":
+                    yield value
+                else:
+                    final = value
+            calls = final.get("tool_calls")
+            if not calls:
+                return
+            self._dispatch(current, final.get("content") or "", calls)
+        yield current[-1].get("content", "")
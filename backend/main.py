@@ -1,14 +1,14 @@
 """FastAPI application with health check and WebSocket support."""
 
 import asyncio
-import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from typing import Any, Optional
+from typing import Any, Callable, Iterator, Optional, TypeVar
 
 from fastapi import FastAPI, File, HTTPException, UploadFile, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 # Import settings from config (path relative to project root)
@@ -20,17 +20,44 @@ if str(_project_root) not in sys.path:
     sys.path.insert(0, str(_project_root))
 
 from config.settings import get_settings
+from backend.ai import _json
+from backend.ai.task_router import TaskRouter
+from backend.middleware import GzipRequestMiddleware
 from backend.services import get_task_router
 from backend.scheduler.scheduler import start_scheduler, stop_scheduler
 from backend.scheduler.daily_tasks import register_daily_jobs
 from backend.scheduler.weekly_tasks import register_weekly_jobs
 
+# Resolved once per process (re-evaluated when uvicorn reloads the module)
+_SETTINGS = get_settings()
+_IS_DEV = _SETTINGS.is_development()
+
 logging.basicConfig(
-    level=getattr(logging, get_settings().log_level.upper(), logging.INFO),
+    level=getattr(logging, _SETTINGS.log_level.upper(), logging.INFO),
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Blocking work (OpenAI calls, ingestion) runs here; sized for concurrent chats rather than CPU count
+_EXECUTOR = ThreadPoolExecutor(max_workers=32, thread_name_prefix="ai")
+
+_router: Optional[TaskRouter] = None
+
+
+def _get_router() -> TaskRouter:
+    """Build the task router on first use and reuse it for later requests."""
+    global _router
+    if _router is None:
+        _router = get_task_router()
+    return _router
+
+
+async def _run_blocking(fn: Callable[[], T]) -> T:
+    """Run a blocking call on the shared worker pool without blocking the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(_EXECUTOR, fn)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -41,6 +68,7 @@ async def lifespan(app: FastAPI):
     start_scheduler()
     yield
     stop_scheduler()
+    _EXECUTOR.shutdown(wait=False)
     logger.info("Shutting down AI Agent backend")
 
 
@@ -51,6 +79,7 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+app.add_middleware(GzipRequestMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -66,7 +95,7 @@ async def global_exception_handler(request, exc):
     logger.exception("Unhandled error: %s", exc)
     return JSONResponse(
         status_code=500,
-        content={"error": "Internal server error", "detail": str(exc) if get_settings().is_development() else None},
+        content={"error": "Internal server error", "detail": str(exc) if _IS_DEV else None},
     )
 
 
@@ -92,15 +121,29 @@ class ChatResponse(BaseModel):
     response: str
 
 
-def _safe_filename(original: str) -> str:
-    """Return a filesystem-safe name: keep extension, use ASCII stem + timestamp to avoid encoding/collision issues."""
+UPLOAD_CHUNK_SIZE = 1 << 16
+
+
+async def _save_upload(file: UploadFile, dst: Any, hasher: Any = None) -> int:
+    """Copy an upload into an open binary file in fixed-size chunks; return bytes written.
+    If hasher is given (a hashlib object), it is fed each chunk as it is written."""
+    total = 0
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        dst.write(chunk)
+        if hasher is not None:
+            hasher.update(chunk)
+        total += len(chunk)
+    return total
+
+
+def _safe_filename(original: str, content_hash: str) -> str:
+    """Return a filesystem-safe name: keep extension, use ASCII stem + content hash to avoid encoding/collision issues."""
     import re
-    import time
     p = Path(original or "upload")
     ext = p.suffix.lower()
     safe_stem = re.sub(r"[^\w\-.]", "_", p.stem)[:80] or "doc"
     safe_stem = safe_stem.encode("ascii", "replace").decode("ascii")
-    return f"{safe_stem}_{int(time.time())}{ext}"
+    return f"{safe_stem}_{content_hash[:12]}{ext}"
 
 
 @app.post("/ingest")
@@ -112,15 +155,28 @@ async def ingest_doc(file: UploadFile = File(...)) -> dict[str, Any]:
         if ext not in allowed:
             raise HTTPException(400, detail=f"Unsupported format. Allowed: {allowed}")
     try:
-        from backend.tasks.document_handler import ingest_document
-        settings = get_settings()
-        settings.documents_dir.mkdir(parents=True, exist_ok=True)
-        safe_name = _safe_filename(file.filename or "upload")
-        path = settings.documents_dir / safe_name
-        content = await file.read()
-        path.write_bytes(content)
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(None, lambda: ingest_document(path, original_name=file.filename))
+        import hashlib
+        import uuid
+        from backend.tasks.document_handler import find_ingested, ingest_document
+        documents_dir = _SETTINGS.documents_dir
+        documents_dir.mkdir(parents=True, exist_ok=True)
+        # Hash while streaming; identical content that was already learned is not re-embedded
+        tmp_path = documents_dir / f".upload_{uuid.uuid4().hex}.part"
+        hasher = hashlib.blake2b(digest_size=16)
+        try:
+            with tmp_path.open("wb") as dst:
+                await _save_upload(file, dst, hasher)
+            content_hash = hasher.hexdigest()
+            previous = await _run_blocking(lambda: find_ingested(content_hash))
+            if previous:
+                return {**previous, "duplicate": True}
+            path = documents_dir / _safe_filename(file.filename or "upload", content_hash)
+            tmp_path.replace(path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        result = await _run_blocking(
+            lambda: ingest_document(path, original_name=file.filename, content_hash=content_hash)
+        )
         if not result.get("success"):
             raise HTTPException(422, detail=result.get("error", "Ingest failed"))
         return result
@@ -129,7 +185,7 @@ async def ingest_doc(file: UploadFile = File(...)) -> dict[str, Any]:
     except Exception as e:
         logger.exception("Ingest failed: %s", e)
         detail = "Document ingestion failed"
-        if get_settings().is_development():
+        if _IS_DEV:
             detail = str(e)
         raise HTTPException(500, detail=detail)
 
@@ -143,17 +199,15 @@ async def transcribe_audio(file: UploadFile = File(...)) -> dict[str, Any]:
         raise HTTPException(400, detail="Missing filename")
     try:
         from backend.ai.llm_service import LLMService
-        content = await file.read()
-        if not content:
-            raise HTTPException(400, detail="Empty file")
         suffix = Path(file.filename).suffix.lower() or ".wav"
         with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
-            tmp.write(content)
             tmp_path = tmp.name
+            size = await _save_upload(file, tmp)
         try:
+            if not size:
+                raise HTTPException(400, detail="Empty file")
             llm = LLMService()
-            loop = asyncio.get_event_loop()
-            text = await loop.run_in_executor(None, lambda: llm.transcribe_audio(tmp_path))
+            text = await _run_blocking(lambda: llm.transcribe_audio(tmp_path))
             return {"text": text or ""}
         finally:
             try:
@@ -167,22 +221,24 @@ async def transcribe_audio(file: UploadFile = File(...)) -> dict[str, Any]:
         raise HTTPException(500, detail="Transcription failed")
 
 
-@app.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest) -> ChatResponse:
-    """Process user message with LLM and tools; return assistant response."""
+def _validate_chat_request(request: ChatRequest) -> None:
+    """Reject empty messages and requests made before an OpenAI key is configured."""
     if not (request.message or request.message.strip()):
         raise HTTPException(400, detail="Message cannot be empty")
-    settings = get_settings()
-    if not (settings.openai_api_key or settings.openai_api_key.strip()):
+    if not (_SETTINGS.openai_api_key or _SETTINGS.openai_api_key.strip()):
         raise HTTPException(
             503,
             detail="OPENAI_API_KEY is not set. Add it to your .env file and restart the backend.",
         )
+
+
+@app.post("/chat", response_model=ChatResponse)
+async def chat(request: ChatRequest) -> ChatResponse:
+    """Process user message with LLM and tools; return assistant response."""
+    _validate_chat_request(request)
     try:
-        router = get_task_router()
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None,
+        router = _get_router()
+        response = await _run_blocking(
             lambda: router.process(
                 request.message,
                 history=request.history,
@@ -193,11 +249,33 @@ async def chat(request: ChatRequest) -> ChatResponse:
     except Exception as e:
         logger.exception("Chat failed: %s", e)
         detail = "Assistant request failed. Please try again."
-        if settings.is_development():
+        if _IS_DEV:
             detail = str(e)
         raise HTTPException(500, detail=detail)
 
 
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest) -> StreamingResponse:
+    """Like /chat, but stream the assistant's text as it is generated (chunked text/plain)."""
+    _validate_chat_request(request)
+    router = _get_router()
+
+    def generate() -> Iterator[str]:
+        try:
+            yield from router.process_stream(
+                request.message,
+                history=request.history,
+                image_url_or_base64=request.image_base64,
+            )
+        except Exception as e:
+            # Headers are already sent, so report the failure in the body
+            logger.exception("Chat stream failed: %s", e)
+            yield f"\n\nAssistant request failed: {e}" if _IS_DEV else "\n\nAssistant request failed. Please try again."
+
+    # Starlette iterates a sync generator in its threadpool, so the event loop is never blocked
+    return StreamingResponse(generate(), media_type="text/plain; charset=utf-8")
+
+
 @app.websocket("/ws/chat")
 async def websocket_chat(websocket: WebSocket):
     """WebSocket endpoint for real-time chat."""
@@ -206,28 +284,27 @@ async def websocket_chat(websocket: WebSocket):
     try:
         while True:
             data = await websocket.receive_text()
-            payload = json.loads(data) if data else {}
+            payload = _json.loads(data) if data else {}
             # Echo back for now; will be wired to LLM and task handlers later
             response = {"type": "message", "content": f"Received: {payload.get('message', data)}"}
-            await websocket.send_json(response)
+            await websocket.send_text(_json.dumps(response))
     except WebSocketDisconnect:
         logger.info("WebSocket client disconnected")
-    except json.JSONDecodeError:
-        await websocket.send_json({"type": "error", "content": "Invalid JSON"})
+    except _json.JSONDecodeError:
+        await websocket.send_text(_json.dumps({"type": "error", "content": "Invalid JSON"}))
     except Exception as e:
         logger.exception("WebSocket error: %s", e)
         try:
-            await websocket.send_json({"type": "error", "content": str(e)})
+            await websocket.send_text(_json.dumps({"type": "error", "content": str(e)}))
         except Exception:
             pass
 
 
 if __name__ == "__main__":
     import uvicorn
-    settings = get_settings()
     uvicorn.run(
         "backend.main:app",
-        host=settings.backend_host,
-        port=settings.backend_port,
-        reload=settings.is_development(),
+        host=_SETTINGS.backend_host,
+        port=_SETTINGS.backend_port,
+        reload=_IS_DEV,
     )
@@ -0,0 +1,76 @@
+"""ASGI middleware for the FastAPI app."""
+
+import zlib
+from typing import Any, Awaitable, Callable
+
+# Reject compressed bodies that would inflate past this (guards against gzip bombs)
+MAX_DECOMPRESSED_BYTES = 64 * 1024 * 1024
+
+Scope = dict[str, Any]
+Message = dict[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+
+
+class GzipRequestMiddleware:
+    """
+    Inflate request bodies sent with Content-Encoding: gzip before the app reads them,
+    so clients can compress large JSON payloads (e.g. chat messages carrying images).
+    """
+
+    def __init__(self, app: Callable[[Scope, Receive, Send], Awaitable[None]]):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or (b"content-encoding", b"gzip") not in {
+            (k.lower(), v.strip().lower()) for k, v in scope["headers"]
+        }:
+            await self.app(scope, receive, send)
+            return
+
+        inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        parts: list[bytes] = []
+        size = 0
+        more_body = True
+        try:
+            while more_body:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    return
+                more_body = message.get("more_body", False)
+                chunk = inflater.decompress(message.get("body", b""), MAX_DECOMPRESSED_BYTES + 1 - size)
+                size += len(chunk)
+                if size > MAX_DECOMPRESSED_BYTES or inflater.unconsumed_tail:
+                    await _reject(send, 413, b"Decompressed request body too large")
+                    return
+                parts.append(chunk)
+            parts.append(inflater.flush())
+            if not inflater.eof:
+                # Body ended before the gzip trailer: truncated upload, not a complete payload
+                raise zlib.error("truncated gzip stream")
+        except zlib.error:
+            await _reject(send, 400, b"Invalid gzip request body")
+            return
+        body = b"".join(parts)
+
+        headers = [(k, v) for k, v in scope["headers"] if k.lower() not in (b"content-encoding", b"content-length")]
+        headers.append((b"content-length", str(len(body)).encode()))
+        sent = False
+
+        async def inflated_receive() -> Message:
+            nonlocal sent
+            if sent:
+                return await receive()
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        await self.app({**scope, "headers": headers}, inflated_receive, send)
+
+
+async def _reject(send: Send, status: int, detail: bytes) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"text/plain; charset=utf-8"), (b"content-length", str(len(detail)).encode())],
+    })
+    await send({"type": "http.response.body", "body": detail})
@@ -0,0 +1,63 @@
+"""Numba-compiled chunk-boundary search for very large documents (optional; needs numpy + numba)."""
+
+import numpy as np
+from numba import njit
+
+_NL = 10  # "\n"
+_DOT = 46  # "."
+_SPACE = 32  # " "
+
+
+@njit(cache=True)
+def chunk_spans(buf: np.ndarray, chunk_size: int, overlap: int) -> np.ndarray:
+    """
+    Return an (n_chunks, 2) array of [start, end) spans using the same break rules
+    as document_processor._chunk_text. buf holds one code point per element, so
+    spans index directly into the original str.
+    """
+    n = buf.shape[0]
+    spans = np.empty((n // max(chunk_size - overlap, 1) + 16, 2), dtype=np.int64)
+    count = 0
+    start = 0
+    while start < n:
+        end = start + chunk_size
+        last = end >= n
+        if last:
+            end = n
+        else:
+            # Last "\n\n", then "\n", then ". " that fits inside buf[start:end + 1]
+            break_at = -1
+            i = end - 1
+            while i >= start:
+                if buf[i] == _NL and buf[i + 1] == _NL:
+                    break_at = i
+                    break
+                i -= 1
+            if break_at == -1:
+                i = end
+                while i >= start:
+                    if buf[i] == _NL:
+                        break_at = i
+                        break
+                    i -= 1
+            if break_at == -1:
+                i = end - 1
+                while i >= start:
+                    if buf[i] == _DOT and buf[i + 1] == _SPACE:
+                        break_at = i
+                        break
+                    i -= 1
+            if break_at != -1 and break_at > start:
+                end = break_at + 1
+        if count == spans.shape[0]:
+            grown = np.empty((count * 2, 2), dtype=np.int64)
+            grown[:count] = spans[:count]
+            spans = grown
+        spans[count, 0] = start
+        spans[count, 1] = end
+        count += 1
+        if last:
+            break
+        next_start = end - overlap if overlap < end else end
+        start = next_start if next_start > start else end
+    return spans[:count]
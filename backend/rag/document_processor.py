@@ -1,6 +1,13 @@
 """Parse PDF, TXT, MD, DOCX into text chunks."""
 
 import logging
+import multiprocessing
+import os
+import re
+import threading
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from typing import Any, Generator
 
@@ -8,6 +15,50 @@ logger = logging.getLogger(__name__)
 
 CHUNK_SIZE = 800
 CHUNK_OVERLAP = 200
+# PDFs with at least this many pages are extracted in parallel, using up to PDF_MAX_WORKERS processes.
+# Below this, handing page ranges to the pool and re-opening the file in each worker costs more than
+# extracting serially.
+PDF_PARALLEL_MIN_PAGES = 64
+PDF_MAX_WORKERS = 8
+
+# Process pool shared by all PDF ingests, started on first use; workers keep pypdf imported between documents
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+# Lookaheads so overlapping matches (e.g. "\n\n\n") are all reported, matching str.rfind
+_PARA_RE = re.compile(r"(?=\n\n)")
+_NEWLINE_RE = re.compile(r"\n")
+_SENTENCE_RE = re.compile(r"(?=\. )")
+_CR_RE = re.compile(r"\r\n?")
+
+# Texts at least this long use the numba kernel when numpy + numba are installed
+JIT_MIN_CHARS = 200_000
+_chunk_spans = None  # resolved on first large document; False when numba is unavailable
+
+
+def _get_chunk_spans():
+    """Lazily import the numba kernel so API startup never pays the numba import."""
+    global _chunk_spans
+    if _chunk_spans is None:
+        try:
+            from backend.rag._chunk_kernel import chunk_spans
+            _chunk_spans = chunk_spans
+        except ImportError:
+            _chunk_spans = False
+    return _chunk_spans
+
+
+def _offsets(pattern: "re.Pattern[str]", text: str) -> list[int]:
+    """Sorted start offsets of every (possibly overlapping) match of pattern."""
+    return [m.start() for m in pattern.finditer(text)]
+
+
+def _last_in_range(offsets: list[int], lo: int, hi: int) -> int:
+    """Largest offset in [lo, hi], or -1. O(log n) via bisect."""
+    k = bisect_right(offsets, hi) - 1
+    if k >= 0 and offsets[k] >= lo:
+        return offsets[k]
+    return -1
 
 
 def _chunk_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> list[str]:
@@ -16,30 +67,94 @@ def _chunk_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OV
         return []
     chunks = []
     start = 0
-    text = text.replace("\r\n", "\n").replace("\r", "\n")
-    while start < len(text):
+    # One pass, and none at all for text without CRs (read_text already applies universal newlines)
+    if "\r" in text:
+        text = _CR_RE.sub("\n", text)
+    if len(text) >= JIT_MIN_CHARS:
+        spans_fn = _get_chunk_spans()
+        if spans_fn:
+            import numpy as np
+            buf = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+            spans = spans_fn(buf, chunk_size, overlap)
+            return [c for c in (text[s:e].strip() for s, e in spans.tolist()) if c]
+    # Index candidate break points once instead of rescanning each window
+    para = _offsets(_PARA_RE, text)
+    newline = _offsets(_NEWLINE_RE, text)
+    sentence = _offsets(_SENTENCE_RE, text)
+    n = len(text)
+    while start < n:
         end = start + chunk_size
-        if end >= len(text):
+        if end >= n:
             chunks.append(text[start:].strip())
             break
-        # Try to break at paragraph or sentence
-        break_at = text.rfind("\n\n", start, end + 1)
+        # Try to break at paragraph or sentence (last match fully inside text[start:end + 1])
+        break_at = _last_in_range(para, start, end - 1)
         if break_at == -1:
-            break_at = text.rfind("\n", start, end + 1)
+            break_at = _last_in_range(newline, start, end)
         if break_at == -1:
-            break_at = text.rfind(". ", start, end + 1)
+            break_at = _last_in_range(sentence, start, end - 1)
         if break_at != -1 and break_at > start:
             end = break_at + 1
         chunks.append(text[start:end].strip())
-        start = end - overlap if overlap < end else end
+        next_start = end - overlap if overlap < end else end
+        # Always move forward (an early break point would otherwise rewind and repeat forever)
+        start = next_start if next_start > start else end
     return [c for c in chunks if c]
 
 
+def _extract_pdf_pages(path: str, start: int, stop: int) -> list[str]:
+    """Worker: extract pages [start, stop). Re-opens the file since readers don't cross processes."""
+    from pypdf import PdfReader
+    reader = PdfReader(path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def _get_pdf_pool(workers: int) -> ProcessPoolExecutor:
+    """Return the process-wide PDF pool, creating it on first use."""
+    global _pdf_pool
+    if _pdf_pool is None:
+        with _pdf_pool_lock:
+            if _pdf_pool is None:
+                # spawn: this runs on executor threads, where forking the server process is unsafe
+                ctx = multiprocessing.get_context("spawn")
+                _pdf_pool = ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+    return _pdf_pool
+
+
+def _reset_pdf_pool(pool: ProcessPoolExecutor) -> None:
+    """Discard a pool that failed (e.g. a worker died) so the next ingest starts a fresh one."""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is pool:
+            _pdf_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_pdf_parallel(path: str, n_pages: int, workers: int) -> list[str]:
+    """Split pages into contiguous ranges, extract them in worker processes, and join in order."""
+    step = -(-n_pages // workers)
+    ranges = [(lo, min(lo + step, n_pages)) for lo in range(0, n_pages, step)]
+    pool = _get_pdf_pool(workers)
+    try:
+        parts = pool.map(_extract_pdf_pages, [path] * len(ranges), *zip(*ranges))
+        return [text for part in parts for text in part]
+    except BrokenProcessPool:
+        _reset_pdf_pool(pool)
+        raise
+
+
 def extract_text_from_pdf(path: Path) -> str:
-    """Extract text from PDF using pypdf."""
+    """Extract text from PDF using pypdf; large PDFs are split across processes."""
     try:
         from pypdf import PdfReader
         reader = PdfReader(str(path))
+        n_pages = len(reader.pages)
+        workers = min(os.cpu_count() or 1, PDF_MAX_WORKERS)
+        if n_pages >= PDF_PARALLEL_MIN_PAGES and workers > 1:
+            try:
+                return "\n".join(_extract_pdf_parallel(str(path), n_pages, workers))
+            except Exception as e:
+                logger.warning("Parallel PDF extract failed for %s, falling back to serial: %s", path, e)
         return "\n".join(page.extract_text() or "" for page in reader.pages)
     except Exception as e:
         logger.warning("PDF extract failed for %s: %s", path, e)
@@ -91,6 +206,6 @@ def process_document(
         return
     chunks = _chunk_text(text, chunk_size=chunk_size, overlap=chunk_overlap)
     base_id = doc_id or path.stem
+    source = path.name
     for i, chunk in enumerate(chunks):
-        meta = {"source": str(path.name), "chunk_index": i}
-        yield chunk, meta
+        yield chunk, {"source": source, "chunk_index": i}
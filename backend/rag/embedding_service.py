@@ -1,14 +1,8 @@
 """Generate embeddings using OpenAI."""
 
-import sys
-from pathlib import Path
 from typing import Optional
 
-_project_root = Path(__file__).resolve().parent.parent.parent
-if str(_project_root) not in sys.path:
-    sys.path.insert(0, str(_project_root))
-
-from backend.ai.llm_service import LLMService
+from backend.ai.llm_service import EMBED_BATCH_SIZE, LLMService
 
 
 class EmbeddingService:
@@ -17,6 +11,6 @@ class EmbeddingService:
     def __init__(self, llm: Optional[LLMService] = None):
         self._llm = llm or LLMService()
 
-    def embed(self, texts: list[str]) -> list[list[float]]:
-        """Return embeddings for a list of texts."""
-        return self._llm.embed(texts)
+    def embed(self, texts: list[str], batch_size: int = EMBED_BATCH_SIZE) -> list[list[float]]:
+        """Return embeddings for a list of texts (sent to the API in batches of batch_size)."""
+        return self._llm.embed(texts, batch_size=batch_size)
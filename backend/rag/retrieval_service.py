@@ -1,15 +1,9 @@
 """Semantic search and context retrieval for RAG."""
 
-import json
 import logging
-import sys
-from pathlib import Path
 from typing import Any, Optional
 
-_project_root = Path(__file__).resolve().parent.parent.parent
-if str(_project_root) not in sys.path:
-    sys.path.insert(0, str(_project_root))
-
+from backend.ai import _json
 from backend.rag.embedding_service import EmbeddingService
 from backend.rag.vector_store import VectorStore
 
@@ -29,7 +23,7 @@ class RetrievalService:
 
     def search(self, query: str, top_k: int = 5) -> list[dict[str, Any]]:
         """Return top_k relevant chunks with metadata."""
-        if self._store.count() == 0:
+        if not self._store.has_data():
             return []
         embeddings = self._embedding.embed([query])
         results = self._store.query(query_embeddings=embeddings, n_results=top_k)
@@ -44,4 +38,5 @@ class RetrievalService:
     def search_json(self, query: str, top_k: int = 5) -> str:
         """Return search results as JSON string for LLM consumption."""
         hits = self.search(query, top_k=top_k)
-        return json.dumps({"results": [{"content": h["content"], "source": h["metadata"].get("source", "")} for h in hits]})
+        payload = {"results": [{"content": h["content"], "source": h["metadata"].get("source", "")} for h in hits]}
+        return _json.dumps(payload)
@@ -1,27 +1,90 @@
 """ChromaDB vector store for document embeddings."""
 
 import logging
-import sys
-from pathlib import Path
-from typing import Any, Optional
+import threading
+from typing import TYPE_CHECKING, Any, Optional
 
-_project_root = Path(__file__).resolve().parent.parent.parent
-if str(_project_root) not in sys.path:
-    sys.path.insert(0, str(_project_root))
+if TYPE_CHECKING:
+    import numpy as np
 
 from config.settings import get_settings
-import chromadb
-from chromadb.config import Settings as ChromaSettings
 
 logger = logging.getLogger(__name__)
 
 COLLECTION_NAME = "documents"
+# Collections up to this size are searched from an in-memory matrix instead of Chroma's index
+DENSE_MAX_ITEMS = 100_000
+# Rows dequantized per matrix product in _DenseIndex.search (bounds the float32 scratch buffer)
+_DENSE_BLOCK_ROWS = 4096
+
+# (persist path, collection name) -> in-memory snapshot, shared by all VectorStore instances.
+# None means "query Chroma directly" (empty or oversized collection).
+_dense_cache: dict[tuple[str, str], Optional["_DenseIndex"]] = {}
+_dense_lock = threading.Lock()
+# Sentinel for a cache miss (None is a valid cached value)
+_MISSING: Any = object()
+
+
+def _normalize(matrix: "np.ndarray") -> "np.ndarray":
+    """L2-normalize rows in place (zero rows are left as-is)."""
+    import numpy as np
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return matrix
+
+
+class _DenseIndex:
+    """
+    L2-normalized copy of a collection for dot-product search, stored as int8 with a
+    per-row scale (4x smaller than float32; top-k ranking is effectively unchanged).
+    """
+
+    def __init__(self, ids: list[str], documents: list[str], metadatas: list[Any], embeddings: Any):
+        import numpy as np
+        self.ids = ids
+        self.documents = documents
+        self.metadatas = metadatas
+        matrix = _normalize(np.array(embeddings, dtype=np.float32))
+        peak = np.abs(matrix).max(axis=1)
+        peak[peak == 0] = 1.0
+        scale = 127.0 / peak
+        self.matrix = np.round(matrix * scale[:, None]).astype(np.int8)
+        self.inv_scale = (1.0 / scale).astype(np.float32)
+
+    def search(self, query_embeddings: list[list[float]], n_results: int) -> dict[str, Any]:
+        """Top n_results per query, shaped like Chroma's query() result."""
+        import numpy as np
+        queries = _normalize(np.array(query_embeddings, dtype=np.float32))
+        n = self.matrix.shape[0]
+        scores = np.empty((queries.shape[0], n), dtype=np.float32)
+        # Dequantize block by block so the products still run through float32 BLAS
+        for lo in range(0, n, _DENSE_BLOCK_ROWS):
+            hi = lo + _DENSE_BLOCK_ROWS
+            block = self.matrix[lo:hi].astype(np.float32)
+            scores[:, lo:hi] = (queries @ block.T) * self.inv_scale[lo:hi]
+        k = min(n_results, scores.shape[1])
+        out: dict[str, Any] = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        for row in scores:
+            # argpartition is O(N); only the k winners are sorted
+            top = np.argpartition(-row, k - 1)[:k] if k < row.shape[0] else np.arange(row.shape[0])
+            top = top[np.argsort(-row[top])]
+            out["ids"].append([self.ids[i] for i in top])
+            out["documents"].append([self.documents[i] for i in top])
+            out["metadatas"].append([self.metadatas[i] for i in top])
+            # Squared L2 between unit vectors, matching Chroma's default "l2" space
+            out["distances"].append((2.0 - 2.0 * row[top]).tolist())
+        return out
 
 
 class VectorStore:
     """ChromaDB-backed vector store for document chunks."""
 
     def __init__(self, persist_directory: Optional[str] = None, collection_name: str = COLLECTION_NAME):
+        # Imported here so modules that only reference VectorStore don't pay the chromadb import
+        import chromadb
+        from chromadb.config import Settings as ChromaSettings
+
         settings = get_settings()
         path = persist_directory or str(settings.embeddings_dir)
         self._client = chromadb.PersistentClient(
@@ -33,6 +96,34 @@ class VectorStore:
             name=collection_name,
             metadata={"description": "Document chunks for RAG"},
         )
+        self._cache_key = (path, collection_name)
+        # Once data is seen the collection stays non-empty until a delete, so skip count() after that
+        self._known_nonempty = False
+
+    def _dense_index(self) -> Optional[_DenseIndex]:
+        """Load (once per process) the in-memory snapshot used by query()."""
+        key = self._cache_key
+        # One lookup, so a concurrent _invalidate() cannot pop the key between check and read
+        cached = _dense_cache.get(key, _MISSING)
+        if cached is not _MISSING:
+            return cached
+        with _dense_lock:
+            cached = _dense_cache.get(key, _MISSING)
+            if cached is not _MISSING:
+                return cached
+            index: Optional[_DenseIndex] = None
+            n = self._collection.count()
+            if 0 < n <= DENSE_MAX_ITEMS:
+                data = self._collection.get(include=["embeddings", "documents", "metadatas"])
+                index = _DenseIndex(data["ids"], data["documents"], data["metadatas"], data["embeddings"])
+                logger.info("Loaded %d chunks into in-memory index", n)
+            _dense_cache[key] = index
+            return index
+
+    def _invalidate(self) -> None:
+        """Drop the snapshot after a write; taken under the lock so an in-flight load cannot re-cache stale data."""
+        with _dense_lock:
+            _dense_cache.pop(self._cache_key, None)
 
     def add(
         self,
@@ -50,6 +141,8 @@ class VectorStore:
         if metadatas is not None:
             kwargs["metadatas"] = metadatas
         self._collection.add(**kwargs)
+        self._known_nonempty = True
+        self._invalidate()
         logger.info("Added %d chunks to vector store", len(ids))
 
     def query(
@@ -59,6 +152,10 @@ class VectorStore:
         where: Optional[dict[str, Any]] = None,
     ) -> dict[str, Any]:
         """Query by embedding; returns ids, documents, metadatas, distances."""
+        if where is None:
+            index = self._dense_index()
+            if index is not None:
+                return index.search(query_embeddings, n_results)
         return self._collection.query(
             query_embeddings=query_embeddings,
             n_results=n_results,
@@ -68,6 +165,14 @@ class VectorStore:
     def delete(self, ids: Optional[list[str]] = None, where: Optional[dict[str, Any]] = None) -> None:
         """Delete by ids or where filter."""
         self._collection.delete(ids=ids, where=where)
+        self._known_nonempty = False
+        self._invalidate()
+
+    def has_data(self) -> bool:
+        """Return True if the collection has any items (memoized once non-empty)."""
+        if not self._known_nonempty:
+            self._known_nonempty = self._collection.count() > 0
+        return self._known_nonempty
 
     def count(self) -> int:
         """Return number of items in collection."""
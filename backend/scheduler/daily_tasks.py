@@ -3,16 +3,12 @@
 import json
 import logging
 import random
-import sys
-from pathlib import Path
-from typing import Any
-
-_project_root = Path(__file__).resolve().parent.parent.parent
-if str(_project_root) not in sys.path:
-    sys.path.insert(0, str(_project_root))
+from datetime import date
 
 from apscheduler.triggers.cron import CronTrigger
 
+from backend.scheduler.notifications import deliver_if_configured, notification_batch
+
 logger = logging.getLogger(__name__)
 
 # In-memory fallback; can be replaced with file/API word list
@@ -47,55 +43,40 @@ QUOTES_SAMPLE = [
     "Believe you can and you're halfway there. — Theodore Roosevelt",
 ]
 
-
-def get_ten_words() -> list[dict[str, Any]]:
-    """Return 10 random words to learn. Extend with API or file later."""
-    pool = list(WORDS_SAMPLE)
-    if len(pool) < 10:
-        return pool
-    return random.sample(pool, 10)
+# Digest lines formatted once at import; jobs sample these directly
+_WORDS_FORMATTED: tuple[str, ...] = tuple(
+    f"• {w['word']}: {w['definition']}\n  Example: {w['example']}" for w in WORDS_SAMPLE
+)
+_QUOTES_FORMATTED: tuple[str, ...] = tuple(f"• {q}" for q in QUOTES_SAMPLE)
 
 
-def get_five_quotes() -> list[str]:
-    """Return 5 random inspiring quotes."""
-    pool = list(QUOTES_SAMPLE)
-    if len(pool) < 5:
-        return pool
-    return random.sample(pool, 5)
+def _sample(pool: tuple[str, ...], k: int) -> list[str]:
+    """
+    Return k items from pool (all of them if pool is smaller), seeded by today's date
+    so a re-run on the same day (restart, misfire) produces the same digest.
+    """
+    if len(pool) < k:
+        return list(pool)
+    return random.Random(date.today().toordinal()).sample(pool, k)
 
 
+@notification_batch()
 def job_daily_words() -> None:
     """Scheduled job: 10 words at 8 AM. Log and optionally send via notification."""
     logger.info("Running daily words job (8 AM)")
-    words = get_ten_words()
-    text = "10 words to learn today:\n\n" + "\n\n".join(
-        f"• {w['word']}: {w['definition']}\n  Example: {w['example']}" for w in words
-    )
+    text = "10 words to learn today:\n\n" + "\n\n".join(_sample(_WORDS_FORMATTED, 10))
     logger.info("Daily words:\n%s", text)
     # TODO: send to NOTIFICATION_EMAIL or in-app when notification system is added
-    _deliver_if_configured("10 Words to Learn", text)
+    deliver_if_configured("10 Words to Learn", text)
 
 
+@notification_batch()
 def job_daily_quotes() -> None:
     """Scheduled job: 5 quotes at 11 AM."""
     logger.info("Running daily quotes job (11 AM)")
-    quotes = get_five_quotes()
-    text = "5 inspiring quotes for you:\n\n" + "\n\n".join(f"• {q}" for q in quotes)
+    text = "5 inspiring quotes for you:\n\n" + "\n\n".join(_sample(_QUOTES_FORMATTED, 5))
     logger.info("Daily quotes:\n%s", text)
-    _deliver_if_configured("5 Inspiring Quotes", text)
-
-
-def _deliver_if_configured(subject: str, body: str) -> None:
-    """If NOTIFICATION_EMAIL is set, send email (requires Gmail handler)."""
-    try:
-        from config.settings import get_settings
-        email = get_settings().notification_email
-        if not email:
-            return
-        from backend.tasks.email_handler import compose_gmail
-        compose_gmail(to=email, subject=subject, body=body)
-    except Exception as e:
-        logger.warning("Could not deliver notification: %s", e)
+    deliver_if_configured("5 Inspiring Quotes", text)
 
 
 def register_daily_jobs() -> None:
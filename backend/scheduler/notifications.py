@@ -0,0 +1,108 @@
+"""Delivery of scheduled-task output to the configured notification email."""
+
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import date
+from typing import Any, Iterator, Optional
+
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Per-thread list of (subject, body) queued by the innermost notification_batch(), if any
+_batch = threading.local()
+
+# NOTIFICATION_EMAIL read once per process; _UNSET until the first notification
+_UNSET: Any = object()
+_notify_email: Optional[str] = _UNSET
+
+# (day, digest of subject+body) for messages already delivered today, oldest first
+SENT_HISTORY_SIZE = 256
+_sent: dict[tuple[int, str], None] = {}
+_sent_lock = threading.Lock()
+
+
+def _sent_key(subject: str, body: str) -> tuple[int, str]:
+    digest = hashlib.blake2b(f"{subject}\x00{body}".encode("utf-8"), digest_size=16).hexdigest()
+    return date.today().toordinal(), digest
+
+
+def _already_sent(key: tuple[int, str]) -> bool:
+    with _sent_lock:
+        return key in _sent
+
+
+def _mark_sent(keys: list[tuple[int, str]]) -> None:
+    with _sent_lock:
+        for key in keys:
+            _sent[key] = None
+        while len(_sent) > SENT_HISTORY_SIZE:
+            del _sent[next(iter(_sent))]
+
+
+def _notification_email() -> Optional[str]:
+    global _notify_email
+    if _notify_email is _UNSET:
+        try:
+            _notify_email = get_settings().notification_email or None
+        except Exception as e:
+            logger.warning("Could not read notification settings: %s", e)
+            return None
+    return _notify_email
+
+
+def deliver_if_configured(subject: str, body: str) -> None:
+    """
+    If NOTIFICATION_EMAIL is set, send email (requires Gmail handler). Inside
+    notification_batch() the message is queued and sent when the block exits.
+    A message identical to one already delivered today, or already queued in the
+    batch, is skipped, so a re-fired job does not send its (date-seeded) digest twice.
+    """
+    email = _notification_email()
+    if not email:
+        return
+    if _already_sent(_sent_key(subject, body)):
+        logger.info("Skipping duplicate notification: %s", subject)
+        return
+    pending = getattr(_batch, "pending", None)
+    if pending is not None:
+        if (subject, body) in pending:
+            logger.info("Skipping duplicate notification: %s", subject)
+        else:
+            pending.append((subject, body))
+        return
+    try:
+        from backend.tasks.email_handler import compose_gmail
+        if compose_gmail(to=email, subject=subject, body=body).get("success"):
+            _mark_sent([_sent_key(subject, body)])
+    except Exception as e:
+        logger.warning("Could not deliver notification: %s", e)
+
+
+def _flush(items: list[tuple[str, str]]) -> None:
+    email = _notification_email()
+    if not email or not items:
+        return
+    try:
+        from backend.tasks.email_handler import compose_gmail_batch
+        result = compose_gmail_batch([(email, subject, body) for subject, body in items])
+        ids = result.get("ids") or []
+        _mark_sent([_sent_key(subject, body) for (subject, body), sent_id in zip(items, ids) if sent_id])
+        if not result.get("success"):
+            logger.warning("Could not deliver notifications: %s", result.get("error"))
+    except Exception as e:
+        logger.warning("Could not deliver notifications: %s", e)
+
+
+@contextmanager
+def notification_batch() -> Iterator[None]:
+    """Collect deliver_if_configured() calls made in this block and send them as one Gmail batch."""
+    outer = getattr(_batch, "pending", None)
+    _batch.pending = []
+    try:
+        yield
+    finally:
+        items, _batch.pending = _batch.pending, outer
+        _flush(items)
@@ -1,14 +1,9 @@
 """APScheduler with timezone support for scheduled tasks."""
 
 import logging
-import sys
-from pathlib import Path
 from typing import Optional
 
-_project_root = Path(__file__).resolve().parent.parent.parent
-if str(_project_root) not in sys.path:
-    sys.path.insert(0, str(_project_root))
-
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 
@@ -16,15 +11,38 @@ from config.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Notification jobs are idempotent, so a late run up to an hour after its slot is still wanted
+MISFIRE_GRACE_SECONDS = 3600
+SCHEDULER_MAX_WORKERS = 20
+
 _scheduler: Optional[BackgroundScheduler] = None
 
 
+def _make_jobstore(url: str):
+    """
+    Persistent job store so jobs are loaded from the database instead of held in
+    memory, and survive restarts; falls back to memory if SQLAlchemy is missing.
+    """
+    try:
+        from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+    except ImportError:
+        from apscheduler.jobstores.memory import MemoryJobStore
+        logger.warning("SQLAlchemy not installed; scheduler jobs are kept in memory")
+        return MemoryJobStore()
+    return SQLAlchemyJobStore(url=url)
+
+
 def get_scheduler() -> BackgroundScheduler:
     """Return singleton BackgroundScheduler with app timezone."""
     global _scheduler
     if _scheduler is None:
         settings = get_settings()
-        _scheduler = BackgroundScheduler(timezone=settings.timezone)
+        _scheduler = BackgroundScheduler(
+            jobstores={"default": _make_jobstore(settings.scheduler_jobstore_url)},
+            executors={"default": ThreadPoolExecutor(SCHEDULER_MAX_WORKERS)},
+            job_defaults={"coalesce": True, "max_instances": 1, "misfire_grace_time": MISFIRE_GRACE_SECONDS},
+            timezone=settings.timezone,
+        )
         logger.info("Scheduler created with timezone=%s", settings.timezone)
     return _scheduler
 
@@ -46,8 +64,27 @@ def stop_scheduler() -> None:
         logger.info("Scheduler stopped")
 
 
-def add_cron_job(job_id: str, func, trigger: CronTrigger, replace_existing: bool = True) -> None:
-    """Add a cron job to the scheduler."""
+def add_cron_job(
+    job_id: str,
+    func,
+    trigger: CronTrigger,
+    replace_existing: bool = True,
+    coalesce: bool = True,
+    misfire_grace_time: Optional[int] = MISFIRE_GRACE_SECONDS,
+) -> None:
+    """
+    Add a cron job to the scheduler. Runs missed while the process was paused
+    (e.g. laptop sleep) collapse into one run if within misfire_grace_time seconds;
+    timing-sensitive jobs should pass coalesce=False and a shorter grace time.
+    """
     s = get_scheduler()
-    s.add_job(func, trigger=trigger, id=job_id, replace_existing=replace_existing)
+    s.add_job(
+        func,
+        trigger=trigger,
+        id=job_id,
+        replace_existing=replace_existing,
+        coalesce=coalesce,
+        misfire_grace_time=misfire_grace_time,
+        max_instances=1,
+    )
     logger.info("Added job %s", job_id)
@@ -1,32 +1,16 @@
 """Weekly scheduled tasks: book summary Monday 9 AM, tech news Tuesday 9 AM."""
 
 import logging
-import sys
-from pathlib import Path
 from typing import Any, Optional
 
-_project_root = Path(__file__).resolve().parent.parent.parent
-if str(_project_root) not in sys.path:
-    sys.path.insert(0, str(_project_root))
-
 from apscheduler.triggers.cron import CronTrigger
 
-logger = logging.getLogger(__name__)
-
+from backend.scheduler.notifications import deliver_if_configured, notification_batch
 
-def _deliver_if_configured(subject: str, body: str) -> None:
-    """If NOTIFICATION_EMAIL is set, send email."""
-    try:
-        from config.settings import get_settings
-        email = get_settings().notification_email
-        if not email:
-            return
-        from backend.tasks.email_handler import compose_gmail
-        compose_gmail(to=email, subject=subject, body=body)
-    except Exception as e:
-        logger.warning("Could not deliver notification: %s", e)
+logger = logging.getLogger(__name__)
 
 
+@notification_batch()
 def job_weekly_book_summary() -> None:
     """Scheduled job: summarize a business/self-help book every Monday 9 AM."""
     logger.info("Running weekly book summary job (Monday 9 AM)")
@@ -41,11 +25,12 @@ Format: Title, Summary, then "Key takeaways:" with bullet points."""
         out = llm.chat(msgs)
         text = out.get("content", "Summary unavailable.")
         logger.info("Book summary:\n%s", text)
-        _deliver_if_configured("Weekly Book Summary & Key Takeaways", text)
+        deliver_if_configured("Weekly Book Summary & Key Takeaways", text)
     except Exception as e:
         logger.exception("Book summary job failed: %s", e)
 
 
+@notification_batch()
 def job_weekly_tech_news() -> None:
     """Scheduled job: 10+ tech/AI news updates every Tuesday 9 AM. Uses news handler."""
     logger.info("Running weekly tech news job (Tuesday 9 AM)")
@@ -54,7 +39,7 @@ def job_weekly_tech_news() -> None:
         text = fetch_tech_news_digest()
         if text:
             logger.info("Tech news digest length: %d", len(text))
-            _deliver_if_configured("Tech News: AI Agents, Trends & Startups", text)
+            deliver_if_configured("Tech News: AI Agents, Trends & Startups", text)
         else:
             logger.warning("Tech news digest empty")
     except Exception as e:
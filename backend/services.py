@@ -1,28 +1,44 @@
-"""Service wiring: function registry with all handlers and task router."""
+"""Service wiring: function registry with all handlers and task router.
 
-import sys
-from pathlib import Path
+Handlers and the RAG stack are imported on first use so processes that only
+need the scheduler do not pay for chromadb/openai/google client imports.
+"""
 
-_project_root = Path(__file__).resolve().parent.parent
-if str(_project_root) not in sys.path:
-    sys.path.insert(0, str(_project_root))
+import threading
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
 
-from backend.ai.function_registry import FunctionRegistry
-from backend.ai.task_router import TaskRouter
-from backend.rag.retrieval_service import RetrievalService
-from backend.tasks.calendar_handler import add_calendar_event
-from backend.tasks.notes_handler import create_apple_note
-from backend.tasks.email_handler import compose_gmail
 
+if TYPE_CHECKING:
+    from backend.ai.function_registry import FunctionRegistry
+    from backend.ai.task_router import TaskRouter
+    from backend.rag.retrieval_service import RetrievalService
 
-def _search_documents(query: str, top_k: int = 5) -> str:
-    """Search learned documents via RAG."""
-    svc = RetrievalService()
-    return svc.search_json(query, top_k=top_k)
 
+_retrieval: Optional["RetrievalService"] = None
+# search_documents calls can run in parallel (TaskRouter._dispatch); only one thread opens the store
+_retrieval_lock = threading.Lock()
+
+
+def _search_documents(query: str, top_k: int = 5) -> str:
+    """Search learned documents via RAG. The vector store is opened on the first search."""
+    global _retrieval
+    if _retrieval is None:
+        with _retrieval_lock:
+            if _retrieval is None:
+                from backend.rag.retrieval_service import RetrievalService
+                _retrieval = RetrievalService()
+    return _retrieval.search_json(query, top_k=top_k)
+
+
+@lru_cache(maxsize=1)
+def get_registry() -> "FunctionRegistry":
+    """Return the shared FunctionRegistry with calendar, notes, email, and document search registered."""
+    from backend.ai.function_registry import FunctionRegistry
+    from backend.tasks.calendar_handler import add_calendar_event
+    from backend.tasks.email_handler import compose_gmail
+    from backend.tasks.notes_handler import create_apple_note
 
-def get_registry() -> FunctionRegistry:
-    """Return a FunctionRegistry with calendar, notes, email, and document search registered."""
     reg = FunctionRegistry()
     reg.register("add_calendar_event", add_calendar_event)
     reg.register("create_apple_note", create_apple_note)
@@ -31,6 +47,7 @@ def get_registry() -> FunctionRegistry:
     return reg
 
 
-def get_task_router() -> TaskRouter:
+def get_task_router() -> "TaskRouter":
     """Return TaskRouter with LLM and registry wired."""
+    from backend.ai.task_router import TaskRouter
     return TaskRouter(registry=get_registry())
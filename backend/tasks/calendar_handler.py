@@ -1,16 +1,15 @@
 """Google Calendar API integration for adding events."""
 
 import logging
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Optional
 
-import sys
-_project_root = Path(__file__).resolve().parent.parent.parent
-if str(_project_root) not in sys.path:
-    sys.path.insert(0, str(_project_root))
+from dateutil import parser as _date_parser
 
 from config.settings import get_settings
+from backend.ai import _json
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
@@ -19,17 +18,35 @@ from googleapiclient.errors import HttpError
 
 logger = logging.getLogger(__name__)
 
+_UTC = timezone.utc
+
 SCOPES = ["https://www.googleapis.com/auth/calendar.events", "https://www.googleapis.com/auth/calendar"]
 TOKEN_PATH = Path(__file__).resolve().parent.parent.parent / "config" / "token_calendar.json"
 
+# Built API clients, per thread (httplib2 connections are not thread-safe), keyed by credential identity
+_services = threading.local()
+
+# TOKEN_PATH -> (credentials, time they stop being reused); valid tokens skip the file read.
+# Entries are dropped CREDS_EXPIRY_MARGIN before the access token expires so it is refreshed first.
+_CREDS_CACHE: dict[str, tuple[Credentials, datetime]] = {}
+CREDS_EXPIRY_MARGIN = timedelta(seconds=60)
+# Reuse window for tokens that carry no expiry
+CREDS_DEFAULT_TTL = timedelta(minutes=30)
+
 
 def _get_credentials() -> Optional[Credentials]:
     """Load or refresh Google Calendar OAuth credentials."""
+    key = str(TOKEN_PATH)
+    # google-auth stores expiry as naive UTC
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    cached = _CREDS_CACHE.get(key)
+    if cached is not None and cached[1] > now + CREDS_EXPIRY_MARGIN:
+        return cached[0]
     settings = get_settings()
     creds = None
     if TOKEN_PATH.exists():
         try:
-            creds = Credentials.from_authorized_user_file(str(TOKEN_PATH), SCOPES)
+            creds = Credentials.from_authorized_user_info(_json.loads(TOKEN_PATH.read_bytes()), SCOPES)
         except Exception as e:
             logger.warning("Failed to load token: %s", e)
     if not creds or not creds.valid:
@@ -44,21 +61,40 @@ def _get_credentials() -> Optional[Credentials]:
             )
             creds = flow.run_local_server(port=0)
         if creds:
-            with open(TOKEN_PATH, "w") as f:
-                f.write(creds.to_json())
+            TOKEN_PATH.write_text(creds.to_json(), encoding="utf-8")
+    if creds and creds.valid:
+        _CREDS_CACHE[key] = (creds, creds.expiry or now + CREDS_DEFAULT_TTL)
+    else:
+        _CREDS_CACHE.pop(key, None)
     return creds
 
 
+def _get_service(creds: Credentials) -> Any:
+    """Return a cached Calendar API client for these credentials, building it on first use."""
+    cache = getattr(_services, "cache", None)
+    if cache is None:
+        cache = _services.cache = {}
+    key = (creds.client_id, creds.refresh_token or creds.token)
+    service = cache.get(key)
+    if service is None:
+        service = build("calendar", "v3", credentials=creds, cache_discovery=False, static_discovery=True)
+        cache[key] = service
+    return service
+
+
 def _parse_datetime(s: str) -> Optional[datetime]:
     """Parse ISO or common datetime string to datetime. Returns UTC naive for API."""
     try:
-        from dateutil import parser as date_parser
-        dt = date_parser.parse(s)
-        if dt.tzinfo:
-            dt = dt.astimezone(__import__("datetime").timezone.utc).replace(tzinfo=None)
-        return dt
+        # ISO 8601 (what the model usually sends) without the general-purpose parser
+        dt = datetime.fromisoformat(s[:-1] + "+00:00" if s.endswith("Z") else s)
     except Exception:
-        return None
+        try:
+            dt = _date_parser.parse(s)
+        except Exception:
+            return None
+    if dt.tzinfo:
+        dt = dt.astimezone(_UTC).replace(tzinfo=None)
+    return dt
 
 
 def add_calendar_event(
@@ -85,7 +121,7 @@ def add_calendar_event(
         "end": {"dateTime": end_dt.strftime("%Y-%m-%dT%H:%M:%S"), "timeZone": "UTC"},
     }
     try:
-        service = build("calendar", "v3", credentials=creds)
+        service = _get_service(creds)
         event = service.events().insert(calendarId="primary", body=body).execute()
         return {"success": True, "event_id": event.get("id"), "html_link": event.get("htmlLink")}
     except HttpError as e:
@@ -1,57 +1,119 @@
 """Document ingestion: process files and add to vector store for RAG."""
 
 import logging
-import re
-import sys
+import threading
+from itertools import islice
 from pathlib import Path
 from typing import Any, Optional, Union, Dict
 
-_project_root = Path(__file__).resolve().parent.parent.parent
-if str(_project_root) not in sys.path:
-    sys.path.insert(0, str(_project_root))
-
+from config.settings import get_settings
+from backend.ai import _json
 from backend.rag.document_processor import process_document
 from backend.rag.embedding_service import EmbeddingService
 from backend.rag.vector_store import VectorStore
 
 logger = logging.getLogger(__name__)
 
+# content hash -> ingest result for every successfully learned upload
+MANIFEST_FILENAME = "ingest_manifest.json"
+_manifest_lock = threading.Lock()
+# Chunks embedded and written to the vector store per round trip
+INGEST_BATCH_SIZE = 64
+# Every ASCII character other than letters, digits, "_" and "-" maps to "_"
+_SAFE_ID_TABLE = str.maketrans({c: "_" for c in map(chr, range(128)) if not (c.isalnum() or c in "_-")})
+
+
+def _manifest_path() -> Path:
+    return get_settings().embeddings_dir / MANIFEST_FILENAME
+
+
+def _load_manifest(path: Path) -> Dict[str, Any]:
+    try:
+        return _json.loads(path.read_bytes())
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning("Failed to read ingest manifest: %s", e)
+        return {}
+
+
+def find_ingested(content_hash: str) -> Optional[Dict[str, Any]]:
+    """Return the recorded ingest result if content with this hash was already learned."""
+    with _manifest_lock:
+        return _load_manifest(_manifest_path()).get(content_hash)
+
+
+def _record_ingested(content_hash: str, result: Dict[str, Any]) -> None:
+    with _manifest_lock:
+        path = _manifest_path()
+        manifest = _load_manifest(path)
+        manifest[content_hash] = result
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(_json.dumps(manifest), encoding="utf-8")
+        tmp.replace(path)
+
 
 def _safe_doc_id(name: str) -> str:
     """ASCII-safe id for ChromaDB (avoids encoding issues with unicode filenames)."""
-    stem = Path(name).stem
-    safe = re.sub(r"[^\w\-]", "_", stem)[:80] or "doc"
-    return safe.encode("ascii", "replace").decode("ascii")
+    stem = Path(name).stem.encode("ascii", "replace").decode("ascii")
+    return stem.translate(_SAFE_ID_TABLE)[:80] or "doc"
+
+
+def _rollback(store: VectorStore, ids: list[str]) -> None:
+    """Remove chunks stored by earlier batches so a failed ingest leaves nothing behind."""
+    if not ids:
+        return
+    try:
+        store.delete(ids=ids)
+    except Exception as e:
+        logger.warning("Failed to remove partially ingested chunks: %s", e)
 
 
 def ingest_document(
     path: Union[str, Path],
     doc_id: Optional[str] = None,
     original_name: Optional[str] = None,
+    content_hash: Optional[str] = None,
 ) -> Dict[str, Any]:
-    """Load document, chunk, embed, and add to vector store. Returns counts."""
+    """
+    Load document, chunk, embed, and add to vector store. Returns counts.
+    If content_hash is given, a successful ingest is recorded for find_ingested().
+    """
     path = Path(path)
     if not path.exists():
         return {"success": False, "error": f"File not found: {path}"}
     base_id = doc_id or _safe_doc_id(original_name or path.name)
     store = VectorStore()
     embed_svc = EmbeddingService()
-    chunks = []
-    metas = []
-    for chunk_text, meta in process_document(path, doc_id=base_id):
-        chunks.append(chunk_text)
-        metas.append(meta)
-    if not chunks:
+    pairs = process_document(path, doc_id=base_id)
+    added: list[str] = []
+    # Embed and store INGEST_BATCH_SIZE chunks at a time so only one batch of vectors is held in memory
+    while True:
+        batch = list(islice(pairs, INGEST_BATCH_SIZE))
+        if not batch:
+            break
+        chunks = [chunk for chunk, _ in batch]
+        metas = [meta for _, meta in batch]
+        ids = [f"{base_id}_{i}" for i in range(len(added), len(added) + len(batch))]
+        try:
+            embeddings = embed_svc.embed(chunks)
+        except Exception as e:
+            logger.exception("Embedding failed: %s", e)
+            _rollback(store, added)
+            return {"success": False, "error": f"Embedding failed: {e}. Check OPENAI_API_KEY and quota."}
+        try:
+            store.add(ids=ids, embeddings=embeddings, documents=chunks, metadatas=metas)
+        except Exception as e:
+            logger.exception("Vector store add failed: %s", e)
+            _rollback(store, added)
+            return {"success": False, "error": str(e)}
+        added.extend(ids)
+    if not added:
         return {"success": False, "error": "No text extracted from document"}
-    try:
-        embeddings = embed_svc.embed(chunks)
-    except Exception as e:
-        logger.exception("Embedding failed: %s", e)
-        return {"success": False, "error": f"Embedding failed: {e}. Check OPENAI_API_KEY and quota."}
-    try:
-        ids = [f"{base_id}_{i}" for i in range(len(chunks))]
-        store.add(ids=ids, embeddings=embeddings, documents=chunks, metadatas=metas)
-    except Exception as e:
-        logger.exception("Vector store add failed: %s", e)
-        return {"success": False, "error": str(e)}
-    return {"success": True, "chunks": len(chunks), "source": original_name or path.name}
+    result = {"success": True, "chunks": len(added), "source": original_name or path.name, "doc_id": base_id}
+    if content_hash:
+        try:
+            _record_ingested(content_hash, result)
+        except Exception as e:
+            logger.warning("Failed to record ingest manifest entry: %s", e)
+    return result
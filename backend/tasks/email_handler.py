@@ -2,16 +2,14 @@
 
 import base64
 import logging
-from email.mime.text import MIMEText
+import threading
+from datetime import datetime, timedelta, timezone
+from email.header import Header
 from pathlib import Path
 from typing import Any, Optional
 
-import sys
-_project_root = Path(__file__).resolve().parent.parent.parent
-if str(_project_root) not in sys.path:
-    sys.path.insert(0, str(_project_root))
-
 from config.settings import get_settings
+from backend.ai import _json
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
@@ -22,15 +20,33 @@ logger = logging.getLogger(__name__)
 
 SCOPES = ["https://www.googleapis.com/auth/gmail.compose", "https://www.googleapis.com/auth/gmail.send"]
 TOKEN_PATH = Path(__file__).resolve().parent.parent.parent / "config" / "token_gmail.json"
+# Gmail accepts up to 100 calls per batch request but recommends staying at or under 50
+GMAIL_BATCH_LIMIT = 50
+
+# Built API clients, per thread (httplib2 connections are not thread-safe), keyed by credential identity
+_services = threading.local()
+
+# TOKEN_PATH -> (credentials, time they stop being reused); valid tokens skip the file read.
+# Entries are dropped CREDS_EXPIRY_MARGIN before the access token expires so it is refreshed first.
+_CREDS_CACHE: dict[str, tuple[Credentials, datetime]] = {}
+CREDS_EXPIRY_MARGIN = timedelta(seconds=60)
+# Reuse window for tokens that carry no expiry
+CREDS_DEFAULT_TTL = timedelta(minutes=30)
 
 
 def _get_credentials() -> Optional[Credentials]:
     """Load or refresh Gmail OAuth credentials."""
+    key = str(TOKEN_PATH)
+    # google-auth stores expiry as naive UTC
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    cached = _CREDS_CACHE.get(key)
+    if cached is not None and cached[1] > now + CREDS_EXPIRY_MARGIN:
+        return cached[0]
     settings = get_settings()
     creds = None
     if TOKEN_PATH.exists():
         try:
-            creds = Credentials.from_authorized_user_file(str(TOKEN_PATH), SCOPES)
+            creds = Credentials.from_authorized_user_info(_json.loads(TOKEN_PATH.read_bytes()), SCOPES)
         except Exception as e:
             logger.warning("Failed to load Gmail token: %s", e)
     if not creds or not creds.valid:
@@ -45,11 +61,51 @@ def _get_credentials() -> Optional[Credentials]:
             )
             creds = flow.run_local_server(port=0)
         if creds:
-            with open(TOKEN_PATH, "w") as f:
-                f.write(creds.to_json())
+            TOKEN_PATH.write_text(creds.to_json(), encoding="utf-8")
+    if creds and creds.valid:
+        _CREDS_CACHE[key] = (creds, creds.expiry or now + CREDS_DEFAULT_TTL)
+    else:
+        _CREDS_CACHE.pop(key, None)
     return creds
 
 
+def _get_service(creds: Credentials) -> Any:
+    """Return a cached Gmail API client for these credentials, building it on first use."""
+    cache = getattr(_services, "cache", None)
+    if cache is None:
+        cache = _services.cache = {}
+    key = (creds.client_id, creds.refresh_token or creds.token)
+    service = cache.get(key)
+    if service is None:
+        service = build("gmail", "v1", credentials=creds, cache_discovery=False, static_discovery=True)
+        cache[key] = service
+    return service
+
+
+_MESSAGE_HEAD = (
+    "To: {to}\r\nSubject: {subject}\r\nMIME-Version: 1.0\r\n"
+    "Content-Type: text/plain; charset=utf-8\r\nContent-Transfer-Encoding: base64\r\n\r\n"
+)
+_HEADER_BREAKS = str.maketrans({"\r": " ", "\n": " "})
+
+
+def _header_value(value: str) -> str:
+    """Header value with no raw line breaks; non-ASCII text is RFC 2047 encoded and folded with CRLF."""
+    value = value.translate(_HEADER_BREAKS)
+    if value.isascii():
+        return value
+    # Header folds long values; the default "\n" would put a bare LF inside the CRLF header block
+    return Header(value, "utf-8").encode(linesep="\r\n")
+
+
+def _encode_message(to: str, subject: str, body: str) -> str:
+    """Build a plain-text RFC 2822 message and return it base64url-encoded for the Gmail API."""
+    head = _MESSAGE_HEAD.format(to=_header_value(to), subject=_header_value(subject))
+    # base64 body in 76-column CRLF lines, so long paragraphs stay under RFC 5322's 998-octet line limit
+    encoded_body = base64.encodebytes(body.encode("utf-8")).replace(b"\n", b"\r\n")
+    return base64.urlsafe_b64encode(head.encode("ascii") + encoded_body).decode("ascii")
+
+
 def compose_gmail(to: str, subject: str, body: str) -> dict[str, Any]:
     """
     Compose and send a Gmail message. Optionally creates draft if send fails.
@@ -57,14 +113,48 @@ def compose_gmail(to: str, subject: str, body: str) -> dict[str, Any]:
     creds = _get_credentials()
     if not creds:
         return {"success": False, "error": "Gmail not authorized. Please complete OAuth flow."}
-    message = MIMEText(body, "plain", "utf-8")
-    message["to"] = to
-    message["subject"] = subject
-    raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
+    raw = _encode_message(to, subject, body)
     try:
-        service = build("gmail", "v1", credentials=creds)
+        service = _get_service(creds)
         sent = service.users().messages().send(userId="me", body={"raw": raw}).execute()
         return {"success": True, "id": sent.get("id"), "message": "Email sent."}
     except HttpError as e:
         logger.exception("Gmail API error: %s", e)
         return {"success": False, "error": str(e)}
+
+
+def compose_gmail_batch(items: list[tuple[str, str, str]]) -> dict[str, Any]:
+    """
+    Send several (to, subject, body) messages using Gmail batch requests, so up to
+    GMAIL_BATCH_LIMIT sends share one HTTP round trip. Returns ids in input order.
+    """
+    if not items:
+        return {"success": True, "ids": [], "message": "Nothing to send."}
+    creds = _get_credentials()
+    if not creds:
+        return {"success": False, "error": "Gmail not authorized. Please complete OAuth flow."}
+    ids: list[Optional[str]] = [None] * len(items)
+    errors: list[str] = []
+
+    def _on_response(request_id: str, response: Any, exception: Optional[Exception]) -> None:
+        if exception is not None:
+            errors.append(f"message {request_id}: {exception}")
+        else:
+            ids[int(request_id)] = response.get("id")
+
+    try:
+        service = _get_service(creds)
+        messages = service.users().messages()
+        for lo in range(0, len(items), GMAIL_BATCH_LIMIT):
+            batch = service.new_batch_http_request(callback=_on_response)
+            for i, (to, subject, body) in enumerate(items[lo:lo + GMAIL_BATCH_LIMIT], lo):
+                raw = _encode_message(to, subject, body)
+                batch.add(messages.send(userId="me", body={"raw": raw}), request_id=str(i))
+            batch.execute()
+    except HttpError as e:
+        logger.exception("Gmail API error: %s", e)
+        return {"success": False, "ids": ids, "error": str(e)}
+    if errors:
+        logger.warning("Gmail batch send had %d failures: %s", len(errors), "; ".join(errors))
+        return {"success": False, "ids": ids, "error": "; ".join(errors)}
+    return {"success": True, "ids": ids, "message": f"{len(items)} emails sent."}
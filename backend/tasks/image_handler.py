@@ -2,29 +2,34 @@
 
 import base64
 import logging
-import sys
-from pathlib import Path
-from typing import Optional
-
-_project_root = Path(__file__).resolve().parent.parent.parent
-if str(_project_root) not in sys.path:
-    sys.path.insert(0, str(_project_root))
+from typing import Optional, Union
 
 from backend.ai.llm_service import LLMService
 
 logger = logging.getLogger(__name__)
 
 
+def _image_url(image: Union[bytes, str], mime_type: str) -> str:
+    """Data URL for raw image bytes or a base64 string (returned as-is if already a data URL)."""
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        return f"data:{mime_type};base64," + base64.b64encode(image).decode("ascii")
+    # Slice compare: only the first five characters of a possibly multi-megabyte string are read
+    if image[:5] == "data:":
+        return image
+    return f"data:{mime_type};base64," + image
+
+
 def analyze_image(
-    image_base64: str,
+    image: Union[bytes, str],
     prompt: str = "Describe this image in detail. Include any text, objects, and context.",
+    mime_type: str = "image/jpeg",
 ) -> str:
     """
-    Analyze an image using GPT-4 Vision. image_base64 is raw base64 string (no data URL prefix).
-    Returns the model's description or analysis.
+    Analyze an image using GPT-4 Vision. image is raw image bytes (preferred; encoded once here)
+    or a base64 string with or without a data URL prefix. Returns the model's description or analysis.
     """
     llm = LLMService()
-    url = f"data:image/jpeg;base64,{image_base64}" if not image_base64.startswith("data:") else image_base64
+    url = _image_url(image, mime_type)
     messages = [
         {
             "role": "user",
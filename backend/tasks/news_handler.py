@@ -1,18 +1,15 @@
 """Social media and news aggregation for tech/AI updates."""
 
 import logging
-import sys
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional
 
-_project_root = Path(__file__).resolve().parent.parent.parent
-if str(_project_root) not in sys.path:
-    sys.path.insert(0, str(_project_root))
-
 from config.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
+REDDIT_SUBREDDITS = ("artificial", "MachineLearning", "artificialintelligence", "startups")
+
 
 def _fetch_reddit_tech() -> list[dict[str, Any]]:
     """Fetch tech/AI posts from Reddit (r/artificial, r/MachineLearning, etc.)."""
@@ -21,24 +18,31 @@ def _fetch_reddit_tech() -> list[dict[str, Any]]:
         settings = get_settings()
         if not settings.reddit_client_id or not settings.reddit_client_secret:
             return []
-        reddit = praw.Reddit(
-            client_id=settings.reddit_client_id,
-            client_secret=settings.reddit_client_secret,
-            user_agent=settings.reddit_user_agent or "AI-Agent/1.0",
-        )
-        items = []
-        for sub in ["artificial", "MachineLearning", "artificialintelligence", "startups"]:
+
+        def fetch(sub: str) -> list[dict[str, Any]]:
             try:
-                subreddit = reddit.subreddit(sub)
-                for post in subreddit.hot(limit=5):
-                    items.append({
+                # praw.Reddit is not thread-safe (shared session, rate limiter, token), so one per worker
+                reddit = praw.Reddit(
+                    client_id=settings.reddit_client_id,
+                    client_secret=settings.reddit_client_secret,
+                    user_agent=settings.reddit_user_agent or "AI-Agent/1.0",
+                )
+                return [
+                    {
                         "title": post.title,
                         "url": f"https://reddit.com{post.permalink}",
                         "source": f"r/{sub}",
                         "score": post.score,
-                    })
+                    }
+                    for post in reddit.subreddit(sub).hot(limit=5)
+                ]
             except Exception as e:
                 logger.warning("Reddit sub %s: %s", sub, e)
+                return []
+
+        # Each hot() listing is a blocking HTTP call; fetch them concurrently (map keeps sub order)
+        with ThreadPoolExecutor(max_workers=len(REDDIT_SUBREDDITS)) as ex:
+            items = [item for batch in ex.map(fetch, REDDIT_SUBREDDITS) for item in batch]
         return items[:20]
     except Exception as e:
         logger.warning("Reddit fetch failed: %s", e)
@@ -71,6 +75,18 @@ def _fetch_twitter_tech() -> list[dict[str, Any]]:
         return []
 
 
+_PLACEHOLDER_TEXT = "[Placeholder: Add more sources or APIs for additional updates.]"
+# Numbered placeholder lines for the usual digest sizes, built once
+_PLACEHOLDERS = tuple(f"{i}. {_PLACEHOLDER_TEXT}" for i in range(1, 33))
+
+
+def _placeholders(start: int, stop: int) -> list[str]:
+    """Placeholder lines numbered start+1..stop."""
+    lines = list(_PLACEHOLDERS[start:stop])
+    lines.extend(f"{i}. {_PLACEHOLDER_TEXT}" for i in range(start + len(lines) + 1, stop + 1))
+    return lines
+
+
 def _format_digest(items: list[dict[str, Any]], min_count: int = 10) -> str:
     """Format items as a text digest. Pad with placeholder if fewer than min_count."""
     lines = []
@@ -84,20 +100,18 @@ def _format_digest(items: list[dict[str, Any]], min_count: int = 10) -> str:
         if source:
             line += f" (Source: {source})"
         lines.append(line)
-    while len(lines) < min_count:
-        lines.append(f"{len(lines)+1}. [Placeholder: Add more sources or APIs for additional updates.]")
+    if len(lines) < min_count:
+        lines.extend(_placeholders(len(lines), min_count))
     return "Tech News: AI Agents, AI Transformation, AI Trends & Startups\n\n" + "\n\n".join(lines)
 
 
 def fetch_tech_news_digest(min_items: int = 10) -> str:
     """Fetch at least min_items tech/AI updates from Reddit (and optionally Twitter) and return formatted digest."""
     items = _fetch_reddit_tech() + _fetch_twitter_tech()
-    # Dedupe by title
-    seen = set()
-    unique = []
+    # Dedupe by stripped title, keeping the first item seen for each
+    unique: dict[str, dict[str, Any]] = {}
     for x in items:
         t = (x.get("title") or "").strip()
-        if t and t not in seen:
-            seen.add(t)
-            unique.append(x)
-    return _format_digest(unique, min_count=min_items)
+        if t and t not in unique:
+            unique[t] = x
+    return _format_digest(list(unique.values()), min_count=min_items)
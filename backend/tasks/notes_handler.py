@@ -1,4 +1,4 @@
-"""Apple Notes creation via AppleScript (macOS)."""
+"""Apple Notes creation via Scripting Bridge, with an AppleScript fallback (macOS)."""
 
 import logging
 import platform
@@ -7,13 +7,39 @@ from typing import Any, Optional
 
 logger = logging.getLogger(__name__)
 
+NOTES_BUNDLE_ID = "com.apple.Notes"
+NOTES_FOLDER = "Notes"
 
-def create_apple_note(title: str, body: str) -> dict[str, Any]:
+# SBApplication for Notes once resolved; False when pyobjc's ScriptingBridge is unavailable
+_notes_app: Any = None
+
+
+def _get_notes_app() -> Optional[Any]:
+    """Return the cached Scripting Bridge proxy for Notes, or None to use osascript."""
+    global _notes_app
+    if _notes_app is None:
+        try:
+            from ScriptingBridge import SBApplication
+            _notes_app = SBApplication.applicationWithBundleIdentifier_(NOTES_BUNDLE_ID) or False
+        except ImportError:
+            _notes_app = False
+    return _notes_app or None
+
+
+def _create_via_bridge(app: Any, title: str, body: str) -> None:
     """
-    Create a new note in Apple Notes. macOS only; uses AppleScript.
+    Create the note with in-process Apple events; the bridge passes Unicode through unescaped.
+    A failed event (no automation permission, missing folder) does not raise by itself, so
+    Scripting Bridge's lastError() is checked and turned into an exception.
     """
-    if platform.system() != "Darwin":
-        return {"success": False, "error": "Apple Notes is only available on macOS."}
+    note = app.classForScriptingClass_("note").alloc().initWithProperties_({"name": title, "body": body})
+    app.folders().objectWithName_(NOTES_FOLDER).notes().addObject_(note)
+    error = app.lastError()
+    if error is not None:
+        raise RuntimeError(error.localizedDescription())
+
+
+def _create_via_osascript(title: str, body: str) -> dict[str, Any]:
     # Escape backslashes and quotes for AppleScript string; newlines -> space to keep one-line script
     def escape(s: str) -> str:
         return s.replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ").replace("\r", " ")
@@ -21,7 +47,7 @@ def create_apple_note(title: str, body: str) -> dict[str, Any]:
     body_esc = escape(body)
     script = f'''
     tell application "Notes"
-        make new note at folder "Notes" with properties {{name: "{title_esc}", body: "{body_esc}"}}
+        make new note at folder "{NOTES_FOLDER}" with properties {{name: "{title_esc}", body: "{body_esc}"}}
     end tell
     '''
     try:
@@ -41,3 +67,20 @@ def create_apple_note(title: str, body: str) -> dict[str, Any]:
     except Exception as e:
         logger.exception("create_apple_note error: %s", e)
         return {"success": False, "error": str(e)}
+
+
+def create_apple_note(title: str, body: str) -> dict[str, Any]:
+    """
+    Create a new note in Apple Notes. macOS only; uses Scripting Bridge (pyobjc)
+    when installed, otherwise AppleScript via osascript.
+    """
+    if platform.system() != "Darwin":
+        return {"success": False, "error": "Apple Notes is only available on macOS."}
+    app = _get_notes_app()
+    if app is not None:
+        try:
+            _create_via_bridge(app, title, body)
+            return {"success": True, "message": f"Note '{title}' created."}
+        except Exception as e:
+            logger.warning("Scripting Bridge Notes error, falling back to osascript: %s", e)
+    return _create_via_osascript(title, body)
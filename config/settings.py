@@ -1,6 +1,7 @@
 """Configuration management with environment variables."""
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -69,6 +70,9 @@ class Settings(BaseSettings):
         default=None, alias="NOTIFICATION_EMAIL"
     )
 
+    # Scheduler job store (SQLAlchemy URL); defaults to SQLite under data/
+    scheduler_db_url: Optional[str] = Field(default=None, alias="SCHEDULER_DB_URL")
+
     @property
     def project_root(self) -> Path:
         return _project_root()
@@ -91,6 +95,13 @@ class Settings(BaseSettings):
     def chat_history_dir(self) -> Path:
         return self.data_dir / "chat_history"
 
+    @property
+    def scheduler_jobstore_url(self) -> str:
+        if self.scheduler_db_url:
+            return self.scheduler_db_url
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        return f"sqlite:///{self.data_dir / 'jobs.sqlite'}"
+
     @property
     def credentials_path(self) -> Path:
         return self.project_root / "config" / "credentials.json"
@@ -99,6 +110,7 @@ class Settings(BaseSettings):
         return self.app_env.lower() == "development"
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Return application settings singleton."""
+    """Return application settings singleton (parsed once; call get_settings.cache_clear() to reload)."""
     return Settings()
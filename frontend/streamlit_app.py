@@ -1,8 +1,14 @@
 """Streamlit chat interface with message display and multi-modal input."""
 
-import base64
+import gc
+import gzip
+import hashlib
+import json
+import os
 import sys
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Iterator, Optional
 
 # Ensure project root is on path
 _project_root = Path(__file__).resolve().parent.parent
@@ -12,7 +18,50 @@ if str(_project_root) not in sys.path:
 import httpx
 import streamlit as st
 
-BACKEND_URL = "http://localhost:8000"
+try:
+    # SIMD base64 codec; several times faster than the stdlib on multi-MB images
+    import pybase64
+
+    def _b64encode(data: bytes) -> str:
+        return pybase64.b64encode_as_string(data)
+
+except ImportError:  # pragma: no cover - pybase64 is optional at runtime
+    import base64
+
+    def _b64encode(data: bytes) -> str:
+        return base64.b64encode(data).decode("ascii")
+
+
+try:
+    # Rust JSON encoder; much faster than json.dumps on payloads holding a multi-MB base64 string
+    import orjson
+
+    def _json_bytes(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+except ImportError:  # pragma: no cover - orjson is optional at runtime
+
+    def _json_bytes(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+
+# Backend base URL; set BACKEND_URL when the API is not on localhost:8000
+BACKEND_URL = os.environ.get("BACKEND_URL", "http://localhost:8000").rstrip("/")
+# Upper bound on one streamed assistant reply kept in the UI and chat history (~1 MB of text)
+MAX_RESPONSE_CHARS = 1_000_000
+# Fail fast when the backend is down (connect/pool) while allowing slow model replies (read)
+HTTP_TIMEOUT = httpx.Timeout(connect=5.0, read=60.0, write=30.0, pool=5.0)
+# Request bodies at least this large are sent gzip-compressed (the backend inflates them)
+GZIP_MIN_BYTES = 32 * 1024
+# Connection pool shared by every backend client this app creates
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=40, keepalive_expiry=30.0)
+# Messages kept in session_state; older ones are dropped so memory stays bounded in long chats
+MAX_SESSION_MESSAGES = 50
+# Messages rendered on every rerun; older ones in the window are shown behind a toggle
+RECENT_MESSAGES = 30
+# Context sent with each /chat request: prior messages and characters per message
+HISTORY_TURNS = 10
+HISTORY_MAX_CHARS = 4000
 
 st.set_page_config(
     page_title="AI Assistant",
@@ -21,153 +70,273 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
-# Simple in-memory chat history for basic frontend (will persist later)
+
+@st.cache_resource
+def get_http_client() -> httpx.Client:
+    """One pooled client per server process, reused across reruns and sessions (keeps connections alive)."""
+    return httpx.Client(
+        base_url=BACKEND_URL,
+        timeout=HTTP_TIMEOUT,
+        limits=HTTP_LIMITS,
+    )
+
+
+def _bounded_text(chunks: Iterator[str], limit: int = MAX_RESPONSE_CHARS) -> Iterator[str]:
+    """Pass streamed text through, stopping at limit characters so one reply cannot grow without bound."""
+    total = 0
+    for text in chunks:
+        if total + len(text) > limit:
+            yield text[: limit - total]
+            yield "\n\n*[Response truncated]*"
+            return
+        total += len(text)
+        yield text
+
+
+def _encode_json_body(payload: dict) -> tuple[bytes, dict[str, str]]:
+    """JSON request body and headers; bodies over GZIP_MIN_BYTES (e.g. with an image) are gzip-compressed."""
+    body = _json_bytes(payload)
+    headers = {"Content-Type": "application/json"}
+    if len(body) >= GZIP_MIN_BYTES:
+        # Level 1: base64 image data gains little from harder compression, but costs far more CPU
+        body = gzip.compress(body, compresslevel=1)
+        headers["Content-Encoding"] = "gzip"
+    return body, headers
+
+
+def _upload_part(uploaded) -> tuple:
+    """Multipart tuple that lets httpx stream the UploadedFile in chunks instead of copying it with read()."""
+    uploaded.seek(0)
+    return (uploaded.name, uploaded, uploaded.type or "application/octet-stream")
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _render_markdown(text: str) -> None:
+    """
+    Render a past (immutable) message. On a cache hit Streamlit replays the stored
+    element instead of re-running st.markdown's dedent/cleanup and proto build.
+    """
+    st.markdown(text)
+
+
+def _content_hash(uploaded) -> str:
+    """Digest of an UploadedFile's bytes, read in place from its buffer (no copy)."""
+    return hashlib.blake2b(uploaded.getbuffer(), digest_size=16).hexdigest()
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _transcribe(name: str, content_hash: str, _file) -> str:
+    """
+    Transcribe an upload via /transcribe. Cached by content hash (the file itself is
+    excluded from the key), so the same audio re-presented on reruns is sent once.
+    """
+    r = get_http_client().post("/transcribe", files={"file": _upload_part(_file)})
+    r.raise_for_status()
+    return r.json().get("text", "")
+
+
+@dataclass(slots=True)
+class Msg:
+    """One chat message held in session state; image_bytes is the raw attached image, if any."""
+
+    role: str
+    content: str
+    image_bytes: Optional[bytes] = None
+
+
+def _release_upload() -> None:
+    """
+    Drop Streamlit's reference to the current attach upload by moving the uploader to a
+    new key, then collect so the file's buffers are freed now rather than retained.
+    """
+    st.session_state.upload_generation += 1
+    gc.collect()
+
+
+def _append_message(message: Msg) -> None:
+    """
+    Add a message, dropping the oldest once more than MAX_SESSION_MESSAGES are held,
+    and record its clipped text as request context (the last HISTORY_TURNS are kept).
+    """
+    history = st.session_state.history_for_payload
+    history.append({"role": message.role, "content": message.content[:HISTORY_MAX_CHARS]})
+    del history[:-HISTORY_TURNS]
+    messages = st.session_state.messages
+    messages.append(message)
+    del messages[:-MAX_SESSION_MESSAGES]
+
+
+def _render_message(msg: Msg) -> None:
+    """Render one history message (text and optional image)."""
+    with st.chat_message(msg.role):
+        if msg.image_bytes:
+            st.image(
+                msg.image_bytes,
+                caption="Attached image",
+                use_container_width=True,
+            )
+        _render_markdown(msg.content)
+
+
+# In-memory chat history for this browser session (the last MAX_SESSION_MESSAGES messages)
 if "messages" not in st.session_state:
     st.session_state.messages = []
-if "pending_image_base64" not in st.session_state:
-    st.session_state.pending_image_base64 = None
+# {"role", "content"} of the last HISTORY_TURNS messages, clipped to HISTORY_MAX_CHARS, ready for /chat
+if "history_for_payload" not in st.session_state:
+    st.session_state.history_for_payload = [
+        {"role": m.role, "content": m.content[:HISTORY_MAX_CHARS]}
+        for m in st.session_state.messages[-HISTORY_TURNS:]
+    ]
+# Raw bytes of the image attached to the next message; kept as bytes in history, base64-encoded only for /chat
+if "pending_image_bytes" not in st.session_state:
+    st.session_state.pending_image_bytes = None
+# Suffix of the attach uploader's key; bumping it gives a fresh, empty uploader
+if "upload_generation" not in st.session_state:
+    st.session_state.upload_generation = 0
 
 # Header
 st.title("AI Assistant")
 st.caption("Chat with your AI assistant. You can type, add images, files, links, or voice.")
 
 # Voice: upload audio file for Whisper transcription (Web Speech API in browser can be used via external tools)
-with st.expander("Voice input (upload audio)"):
-    voice_file = st.file_uploader("Upload audio to transcribe", type=["wav", "mp3", "m4a", "webm"], key="voice")
-    if voice_file:
-        try:
-            with httpx.Client(timeout=30.0) as client:
-                r = client.post(
-                    f"{BACKEND_URL}/transcribe",
-                    files={"file": (voice_file.name, voice_file.read())},
-                )
-            r.raise_for_status()
-            text = r.json().get("text", "")
-            if text:
-                st.session_state.setdefault("transcribed_text", text)
-                st.text_area("Transcribed text (edit if needed)", value=text, key="transcribed_edit", height=80)
-        except Exception as e:
-            st.error(f"Transcription failed: {e}")
+@st.fragment
+def _voice_expander() -> None:
+    """Voice panel; as a fragment, its widgets rerun only this function, not the whole chat."""
+    with st.expander("Voice input (upload audio)"):
+        voice_file = st.file_uploader("Upload audio to transcribe", type=["wav", "mp3", "m4a", "webm"], key="voice")
+        if voice_file:
+            try:
+                text = _transcribe(voice_file.name, _content_hash(voice_file), voice_file)
+                if text:
+                    st.text_area("Transcribed text (edit if needed)", value=text, key="transcribed_edit", height=80)
+            except Exception as e:
+                st.error(f"Transcription failed: {e}")
+
 
 # Attach menu (ChatGPT-like + button). Allows adding files, Drive links, or a placeholder for image generation.
-if "show_attach_menu" not in st.session_state:
-    st.session_state.show_attach_menu = False
-
-col1, col2 = st.columns([0.06, 0.94])
-with col1:
-    if st.button("+", key="attach_toggle"):
-        st.session_state.show_attach_menu = not st.session_state.show_attach_menu
-with col2:
-    st.markdown("\n")
-
-if st.session_state.show_attach_menu:
-    with st.container():
-        st.markdown("**Add (choose an option):**")
-        c1, c2, c3 = st.columns([1, 1, 1])
-        with c1:
-            if st.button("Add photos & files", key="attach_files"):
-                st.session_state._attach_action = "files"
-        with c2:
-            if st.button("Add from Google Drive", key="attach_drive"):
-                st.session_state._attach_action = "drive"
-        with c3:
-            if st.button("Create image", key="attach_create"):
-                st.session_state._attach_action = "create"
-
-        action = st.session_state.get("_attach_action")
-        if action == "files":
-            uploaded = st.file_uploader(
-                "Add image or document (PNG/JPG/PDF/TXT/MD/DOCX)",
-                type=["png", "jpg", "jpeg", "gif", "webp", "pdf", "txt", "md", "docx"],
-                accept_multiple_files=False,
-                key="attach_file_uploader",
-            )
-            if uploaded:
-                name = uploaded.name.lower()
-                if name.endswith((".png", ".jpg", ".jpeg", ".gif", ".webp")):
-                    st.session_state.pending_image_base64 = base64.b64encode(uploaded.read()).decode()
-                    st.image(base64.b64decode(st.session_state.pending_image_base64), caption=f"Image: {uploaded.name}", use_container_width=True)
-                elif name.endswith((".pdf", ".txt", ".md", ".docx")):
-                    try:
-                        with httpx.Client(timeout=30.0) as client:
-                            r = client.post(
-                                f"{BACKEND_URL}/ingest",
-                                files={"file": (uploaded.name, uploaded.read())},
+@st.fragment
+def _attach_menu() -> None:
+    """Attach menu; as a fragment, its buttons and inputs rerun only this function."""
+    if "show_attach_menu" not in st.session_state:
+        st.session_state.show_attach_menu = False
+
+    col1, col2 = st.columns([0.06, 0.94])
+    with col1:
+        if st.button("+", key="attach_toggle"):
+            st.session_state.show_attach_menu = not st.session_state.show_attach_menu
+    with col2:
+        st.markdown("\n")
+
+    if st.session_state.show_attach_menu:
+        with st.container():
+            st.markdown("**Add (choose an option):**")
+            c1, c2, c3 = st.columns([1, 1, 1])
+            with c1:
+                if st.button("Add photos & files", key="attach_files"):
+                    st.session_state._attach_action = "files"
+            with c2:
+                if st.button("Add from Google Drive", key="attach_drive"):
+                    st.session_state._attach_action = "drive"
+            with c3:
+                if st.button("Create image", key="attach_create"):
+                    st.session_state._attach_action = "create"
+
+            action = st.session_state.get("_attach_action")
+            if action == "files":
+                uploaded = st.file_uploader(
+                    "Add image or document (PNG/JPG/PDF/TXT/MD/DOCX)",
+                    type=["png", "jpg", "jpeg", "gif", "webp", "pdf", "txt", "md", "docx"],
+                    accept_multiple_files=False,
+                    key=f"attach_file_uploader_{st.session_state.upload_generation}",
+                )
+                if uploaded:
+                    name = uploaded.name.lower()
+                    if name.endswith((".png", ".jpg", ".jpeg", ".gif", ".webp")):
+                        st.session_state.pending_image_bytes = uploaded.getvalue()
+                        st.image(st.session_state.pending_image_bytes, caption=f"Image: {uploaded.name}", use_container_width=True)
+                    elif name.endswith((".pdf", ".txt", ".md", ".docx")):
+                        try:
+                            r = get_http_client().post(
+                                "/ingest",
+                                files={"file": _upload_part(uploaded)},
                             )
-                        r.raise_for_status()
-                        data = r.json()
-                        if data.get("success"):
-                            st.success(f"Document '{uploaded.name}' has been learned ({data.get('chunks', 0)} chunks). You can ask questions about it.")
-                        else:
-                            st.error(data.get("error", "Ingest failed"))
-                    except Exception as e:
-                        st.error(f"Upload failed: {e}")
-                    # Clear action after processing
+                            r.raise_for_status()
+                            data = r.json()
+                            if data.get("success"):
+                                st.success(f"Document '{uploaded.name}' has been learned ({data.get('chunks', 0)} chunks). You can ask questions about it.")
+                            else:
+                                st.error(data.get("error", "Ingest failed"))
+                        except Exception as e:
+                            st.error(f"Upload failed: {e}")
+                        # Clear action after processing
+                        st.session_state._attach_action = None
+                        _release_upload()
+            elif action == "drive":
+                drive_url = st.text_input("Paste Google Drive share link or file URL:", key="drive_url_input")
+                if drive_url:
+                    _append_message(Msg("user", f"[Drive link] {drive_url}"))
+                    st.toast("Drive link added to the conversation. (Automatic Drive fetch is not implemented yet.)")
                     st.session_state._attach_action = None
-        elif action == "drive":
-            drive_url = st.text_input("Paste Google Drive share link or file URL:", key="drive_url_input")
-            if drive_url:
-                st.session_state.messages.append({"role": "user", "content": f"[Drive link] {drive_url}", "image_base64": None})
-                st.success("Drive link added to the conversation. (Automatic Drive fetch is not implemented yet.)")
-                st.session_state._attach_action = None
-        elif action == "create":
-            prompt_img = st.text_input("Image prompt (placeholder for future generator):", key="create_prompt")
-            if st.button("Generate image (placeholder)", key="create_go"):
-                st.info("Image generation is not implemented in this demo. Use 'Add photos & files' to upload an image.")
-                st.session_state._attach_action = None
-else:
-    # ensure action cleared when menu hidden
-    st.session_state._attach_action = None
-
-# Display message history (text and optional image)
-for msg in st.session_state.messages:
-    with st.chat_message(msg["role"]):
-        if msg.get("image_base64"):
-            st.image(
-                base64.b64decode(msg["image_base64"]),
-                caption="Attached image",
-                use_container_width=True,
-            )
-        st.markdown(msg["content"])
+                    # The history is rendered outside this fragment; rerun the app so it shows the link
+                    st.rerun()
+            elif action == "create":
+                prompt_img = st.text_input("Image prompt (placeholder for future generator):", key="create_prompt")
+                if st.button("Generate image (placeholder)", key="create_go"):
+                    st.info("Image generation is not implemented in this demo. Use 'Add photos & files' to upload an image.")
+                    st.session_state._attach_action = None
+    else:
+        # ensure action cleared when menu hidden
+        st.session_state._attach_action = None
+
+
+_voice_expander()
+_attach_menu()
+
+# Display message history: the last RECENT_MESSAGES always, older ones only on request
+older = st.session_state.messages[:-RECENT_MESSAGES]
+if older and st.toggle(f"Show {len(older)} older messages", key="show_older_messages"):
+    # A toggle rather than st.expander: expander bodies run (and render) even when collapsed
+    for msg in older:
+        _render_message(msg)
+for msg in st.session_state.messages[-RECENT_MESSAGES:]:
+    _render_message(msg)
 
-# Chat input: allow pasting transcribed voice text
+# Chat input: transcribed voice text can be pasted from the voice panel
 prompt = st.chat_input("Type your message or paste a link...")
-if "transcribed_text" in st.session_state and st.session_state.transcribed_text:
-    # Prefill not straightforward in Streamlit chat_input; user can paste from expander
-    pass
 if prompt:
-    image_b64 = st.session_state.pending_image_base64
-    st.session_state.pending_image_base64 = None
-    st.session_state.messages.append({
-        "role": "user",
-        "content": prompt,
-        "image_base64": image_b64,
-    })
+    image_bytes = st.session_state.pending_image_bytes
+    st.session_state.pending_image_bytes = None
+    if image_bytes:
+        # The image now lives in history; drop the uploader's copy so it is not attached again
+        _release_upload()
+    # Context is the prior messages only, so take it before this one is appended
+    history = st.session_state.history_for_payload[:]
+    _append_message(Msg("user", prompt, image_bytes))
     with st.chat_message("user"):
-        if image_b64:
-            st.image(base64.b64decode(image_b64), caption="Attached", use_container_width=True)
+        if image_bytes:
+            st.image(image_bytes, caption="Attached", use_container_width=True)
         st.markdown(prompt)
     with st.chat_message("assistant"):
         try:
-            history = [
-                {"role": m["role"], "content": m["content"]}
-                for m in st.session_state.messages[:-1]
-            ]
             payload = {"message": prompt, "history": history}
-            if image_b64:
-                payload["image_base64"] = image_b64
-            with httpx.Client(timeout=60.0) as client:
-                r = client.post(f"{BACKEND_URL}/chat", json=payload)
-            r.raise_for_status()
-            data = r.json()
-            response = data.get("response", "")
+            if image_bytes:
+                # The only base64 encode of the image: the JSON API needs it as text
+                payload["image_base64"] = _b64encode(image_bytes)
+            body, headers = _encode_json_body(payload)
+            with get_http_client().stream("POST", "/chat/stream", content=body, headers=headers) as r:
+                if r.is_error:
+                    r.read()
+                r.raise_for_status()
+                # write_stream renders text as it arrives and returns the full string
+                response = st.write_stream(_bounded_text(r.iter_text())) or ""
         except httpx.HTTPStatusError as e:
             try:
                 detail = e.response.json().get("detail", e.response.text)
             except Exception:
                 detail = str(e)
             response = f"Assistant error ({e.response.status_code}): {detail}"
+            st.markdown(response)
         except Exception as e:
             response = f"Error calling assistant: {e}"
-        st.markdown(response)
-        st.session_state.messages.append({"role": "assistant", "content": response})
+            st.markdown(response)
+        _append_message(Msg("assistant", response))